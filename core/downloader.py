@@ -2,12 +2,17 @@
 # Licensed under Apache License 2.0 (Non-Commercial Use Only)
 # Disclaimer: Use at your own risk. The author is not responsible for any damages.
 
+import contextlib
+import os
+import random
+import threading
 import time
 import requests
-from datetime import datetime
-from pathlib import Path
+from requests.adapters import HTTPAdapter
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from dataclasses import dataclass
-from urllib.parse import urlparse
+from typing import Iterator
 
 from core.exif_handler import write_exif_time
 from core.logger import get_logger
@@ -21,21 +26,84 @@ logger = get_logger()
 # Minimum file size to accept as a valid image (5KB)
 MIN_IMAGE_SIZE = 5120
 
-# Fixed polite delay between every successful download request (seconds).
-# Applied after a successful download only — not on skip, backoff, or failure.
-DELAY_BETWEEN_REQUESTS = 0.1
+# Chunk size used when streaming a response body to disk (64KB).
+DOWNLOAD_CHUNK_SIZE = 65536
+
+# Suffix of the temporary file an image is streamed into before being
+# atomically renamed to its final name.
+PARTIAL_SUFFIX = ".part"
+
+# Write buffer for saved image files (64KB).
+# Larger than Python's 8KB default so each image lands in a few large writes,
+# which keeps syscall count and file fragmentation down on NTFS / SMB shares.
+WRITE_BUFFER_SIZE = 65536
+
+# Maximum number of requests started per second, across all download workers.
+# Enforced by one process-wide token bucket (see _RateLimiter), so adding
+# workers overlaps round-trips without raising the request rate.
+DOWNLOAD_RATE = 10.0
+
+# Base backoff for transient failures (seconds): HTTP 429, 408 and 5xx
+# responses, timeouts and connection errors. Doubles on each further 429 for
+# the same URL, and for every consecutive transient failure of a domain past
+# REPEAT_FAIL_THRESHOLD, plus jitter (see _backoff_delay()).
+# A Retry-After header on a 429 takes precedence over this value.
+# Applies to the failing domain only, on top of the DOWNLOAD_RATE limit.
+BACKOFF_BASE = 1.0
+
+# Flat backoff when the same domain keeps failing with a non-transient error
+# (e.g. HTTP 403) past REPEAT_FAIL_THRESHOLD (seconds). Not exponential: such
+# a failure says nothing about server load, so waiting longer does not help.
+BACKOFF_ON_REPEAT_FAIL = 6.0
 
-# Backoff duration when server responds with HTTP 429 Too Many Requests (seconds).
-# Replaces the normal delay — not added on top of it.
-BACKOFF_ON_429 = 8.0
+# Responses meaning the image itself is gone. Common for old posts; the host
+# is healthy, so these never count toward the domain's failure backoff.
+GONE_STATUS_CODES = frozenset({404, 410})
 
-# Backoff duration when the same domain fails consecutively (seconds).
-# Replaces the normal delay — not added on top of it.
-BACKOFF_ON_REPEAT_FAIL = 6.0
+# Upper bound for any single backoff before jitter, including Retry-After (seconds).
+MAX_BACKOFF = 30.0
+
+# Random extra fraction added to computed backoffs (0.5 = up to +50%),
+# so concurrent workers backing off together do not all retry in lock-step.
+BACKOFF_JITTER = 0.5
+
+# Number of times a URL answered with HTTP 429 is retried before giving up.
+MAX_RETRIES_ON_429 = 3
 
 # Number of consecutive failures from the same domain before backoff triggers.
 REPEAT_FAIL_THRESHOLD = 3
 
+# Maximum number of downloads in flight at once.
+# The workload is network-latency bound, so a small worker pool overlaps
+# round-trips without putting noticeable load on the image servers.
+MAX_CONCURRENT_DOWNLOADS = 8
+
+# Maximum number of downloads in flight to any single host.
+# Plurk images mostly come from one or two CDN hosts; this keeps the worker
+# pool from pointing every connection at the same host at once.
+MAX_DOWNLOADS_PER_HOST = 4
+
+# ==========================================
+# Module-level HTTP session
+# ==========================================
+# One session shared by every download so TCP/TLS connections to the image
+# CDNs are kept alive and reused instead of re-handshaking per image.
+# pool_maxsize: connection pools are per host, and at most
+#   MAX_DOWNLOADS_PER_HOST downloads run against one host — every connection
+#   the pool opens is kept and reused, so a run costs at most that many
+#   TLS handshakes per image host.
+# pool_block=True: never open throwaway connections past that limit.
+# max_retries=0: retries and backoff are handled by this module, not urllib3.
+_SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=MAX_DOWNLOADS_PER_HOST,
+    pool_block=True,
+    max_retries=0,
+)
+_SESSION.mount("https://", _adapter)
+_SESSION.mount("http://", _adapter)
+
 # ==========================================
 # Module-level domain failure tracker
 # ==========================================
@@ -43,10 +111,55 @@ REPEAT_FAIL_THRESHOLD = 3
 # Keyed by domain string (e.g. "images.plurk.com").
 # Resets to 0 on first successful download from that domain.
 # Module-level so state persists across all download_image() calls in one run.
+# Guarded by _domain_lock since download_image() runs on several worker threads.
 _domain_fail_count: dict[str, int] = {}
 
+# time.monotonic() deadline before which no new request may go to a domain.
+# Backoffs extend this deadline instead of sleeping the worker that hit them;
+# each worker waits it out only before its next request to that domain.
+_domain_resume_at: dict[str, float] = {}
+
+# Per-domain semaphore limiting concurrent downloads to MAX_DOWNLOADS_PER_HOST.
+# Created on first use by _host_slot().
+_host_slots: dict[str, threading.BoundedSemaphore] = {}
+
+_domain_lock = threading.Lock()
+
+
+class _RateLimiter:
+    """
+    Thread-safe token bucket shared by every download worker.
+    Refills at rate tokens per second up to capacity; each request takes one
+    token, and workers only sleep while the bucket is empty — so the overall
+    request rate stays at rate no matter how many workers are running.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available, then take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self._rate
+            time.sleep(wait)
+
+
+# Process-wide limiter — allows a burst of up to one second's worth of requests.
+_LIMITER = _RateLimiter(DOWNLOAD_RATE, DOWNLOAD_RATE)
+
 
-@dataclass
+@dataclass(slots=True)
 class DownloadResult:
     """
     Structured result for a single image download attempt.
@@ -62,57 +175,252 @@ class DownloadResult:
 
 
 def _extract_domain(url: str) -> str:
-    """Extract the netloc domain from a URL for use as a failure tracker key."""
+    """
+    Extract the netloc domain from a URL for use as a failure tracker key.
+    download_image() only accepts http(s)://host/... URLs, so the netloc is
+    simply the third '/'-separated field — no need for a full urlparse().
+    """
     try:
-        return urlparse(url).netloc
-    except Exception:
+        return url.split("/", 3)[2].lower()
+    except IndexError:
         return "unknown"
 
 
-def _record_failure(domain: str) -> None:
+def url_file_name(url: str) -> str:
+    """
+    Return the file name an image URL is saved under:
+    the last path segment with any query string stripped.
+    """
+    return url.rpartition("/")[2].partition("?")[0]
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """
+    Parse an HTTP Retry-After header into seconds from now.
+    Accepts both forms allowed by RFC 9110: delay-seconds and HTTP-date.
+    Returns None if the header is missing or unparseable.
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def _backoff_delay(base: float, attempt: int, retry_after: float | None = None) -> float:
+    """
+    Compute how long to back off (seconds).
+    A server-provided Retry-After is honoured as-is (capped at MAX_BACKOFF).
+    Otherwise: exponential backoff min(MAX_BACKOFF, base * 2**attempt),
+    stretched by a random BACKOFF_JITTER fraction to decorrelate workers.
+    """
+    if retry_after is not None:
+        return min(retry_after, MAX_BACKOFF)
+
+    delay = min(MAX_BACKOFF, base * 2 ** attempt)
+    return delay * (1 + random.uniform(0, BACKOFF_JITTER))
+
+
+def _defer_domain(domain: str, delay: float) -> None:
+    """
+    Hold back new requests to domain for delay seconds from now.
+    Never shortens a deadline that is already further in the future.
+    """
+    with _domain_lock:
+        resume_at = time.monotonic() + delay
+        if resume_at > _domain_resume_at.get(domain, 0.0):
+            _domain_resume_at[domain] = resume_at
+
+
+def _domain_wait_remaining(domain: str) -> float:
+    """Return the seconds left on domain's current delay or backoff (<= 0 if none)."""
+    with _domain_lock:
+        return _domain_resume_at.get(domain, 0.0) - time.monotonic()
+
+
+def _wait_for_domain(domain: str) -> None:
+    """
+    Block the calling worker until domain's current delay or backoff has elapsed.
+    Loops because another worker may extend the deadline while this one sleeps.
+    Only this worker sleeps — it holds no host slot or lock while waiting.
+    """
+    while True:
+        remaining = _domain_wait_remaining(domain)
+        if remaining <= 0:
+            return
+        time.sleep(remaining)
+
+
+def _host_slot(domain: str) -> threading.BoundedSemaphore:
+    """
+    Return the semaphore limiting concurrent downloads from domain.
+    Hold it (with-statement) for one request attempt, including the body
+    transfer, but not across backoff waits (see _get_with_retry()).
+    """
+    with _domain_lock:
+        slot = _host_slots.get(domain)
+        if slot is None:
+            slot = _host_slots[domain] = threading.BoundedSemaphore(MAX_DOWNLOADS_PER_HOST)
+    return slot
+
+
+def _is_transient_status(status_code: int) -> bool:
+    """Return whether an HTTP error status is worth backing off for (408 and 5xx)."""
+    return status_code == 408 or status_code >= 500
+
+
+def _record_failure(domain: str, transient: bool = True) -> None:
     """
     Increment the consecutive failure count for a domain.
-    If the count reaches REPEAT_FAIL_THRESHOLD, sleep BACKOFF_ON_REPEAT_FAIL.
-    Backoff replaces the normal per-request delay — not added on top.
+    If the count reaches REPEAT_FAIL_THRESHOLD, back off: exponentially from
+    BACKOFF_BASE for transient failures, by a flat BACKOFF_ON_REPEAT_FAIL otherwise.
     """
-    _domain_fail_count[domain] = _domain_fail_count.get(domain, 0) + 1
-    count = _domain_fail_count[domain]
+    with _domain_lock:
+        _domain_fail_count[domain] = _domain_fail_count.get(domain, 0) + 1
+        count = _domain_fail_count[domain]
 
     if count >= REPEAT_FAIL_THRESHOLD:
+        if transient:
+            delay = _backoff_delay(BACKOFF_BASE, count - REPEAT_FAIL_THRESHOLD)
+        else:
+            delay = BACKOFF_ON_REPEAT_FAIL
         logger.warning(
             f"domain '{domain}' failed {count} times consecutively — "
-            f"backing off {BACKOFF_ON_REPEAT_FAIL}s"
+            f"backing off {delay:.1f}s"
         )
-        time.sleep(BACKOFF_ON_REPEAT_FAIL)
+        _defer_domain(domain, delay)
 
 
 def _record_success(domain: str) -> None:
     """
-    Reset the failure count for a domain after a successful download,
-    then apply the standard polite delay between requests.
+    Reset the failure count for a domain after a successful download.
     """
-    if _domain_fail_count.get(domain, 0) > 0:
-        logger.debug(f"domain '{domain}' recovered — resetting fail count")
-    _domain_fail_count[domain] = 0
-    time.sleep(DELAY_BETWEEN_REQUESTS)
+    with _domain_lock:
+        recovered = _domain_fail_count.get(domain, 0) > 0
+        _domain_fail_count[domain] = 0
+    if recovered:
+        logger.debug("domain '%s' recovered — resetting fail count", domain)
+
+
+def _declared_length(res: requests.Response) -> int | None:
+    """
+    Return the body size announced by the Content-Length header.
+    Returns None if the header is missing or invalid, or if the body is
+    content-encoded (the header then counts compressed bytes, not image bytes).
+    """
+    if res.headers.get("Content-Encoding", "identity").lower() != "identity":
+        return None
+    value = res.headers.get("Content-Length", "")
+    return int(value) if value.isdigit() else None
+
+
+def _discard_body(res: requests.Response) -> None:
+    """
+    Read and drop the body of a response we are not going to save.
+    A small body (error page, placeholder) is cheaper to drain than a new
+    TCP+TLS handshake, and draining lets the keep-alive connection go back
+    to the pool. Large or unknown-size bodies are left for close(), which
+    drops the connection instead of downloading data nobody needs.
+    """
+    length = _declared_length(res)
+    if length is None or length > DOWNLOAD_CHUNK_SIZE:
+        return
+    try:
+        res.content
+    except requests.exceptions.RequestException:
+        pass  # connection is simply dropped on close()
+
+
+@contextlib.contextmanager
+def _get_with_retry(url: str, domain: str) -> Iterator[requests.Response]:
+    """
+    Issue a streaming GET for url, retrying on HTTP 429 Too Many Requests.
+    Before each attempt: waits out any pending backoff on the domain, then
+    takes one of its host slots and a DOWNLOAD_RATE token.
+    Each 429 defers the domain by _backoff_delay() — the server's Retry-After
+    when given, exponential backoff with jitter otherwise — then retries the
+    same URL, up to MAX_RETRIES_ON_429 times.
+
+    Use as a with-statement. Yields the final response, which is closed on
+    exit. It is still a 429 if every retry was rate limited.
+    The host slot is held per attempt only: from the request until the
+    yielded response is done with, never across a backoff wait.
+    """
+    slot = _host_slot(domain)
+    attempt = 0
+    while True:
+        _wait_for_domain(domain)
+        with slot:
+            # Another worker may have deferred the domain while this one
+            # waited for the slot — give the slot back and wait again
+            if _domain_wait_remaining(domain) > 0:
+                continue
+
+            _LIMITER.acquire()
+            res = _SESSION.get(url, timeout=15, stream=True)
+            if res.status_code != 429:
+                with res:
+                    yield res
+                return
+
+            _discard_body(res)
+            res.close()
+
+        with _domain_lock:
+            _domain_fail_count[domain] = _domain_fail_count.get(domain, 0) + 1
+
+        retry_after = _parse_retry_after(res.headers.get("Retry-After"))
+        delay = _backoff_delay(BACKOFF_BASE, attempt, retry_after)
+        logger.warning(
+            f"HTTP 429 Too Many Requests — backing off {delay:.1f}s "
+            f"(attempt {attempt + 1}/{MAX_RETRIES_ON_429 + 1}"
+            f"{', Retry-After' if retry_after is not None else ''}): {url}"
+        )
+        _defer_domain(domain, delay)
+
+        if attempt >= MAX_RETRIES_ON_429:
+            yield res
+            return
+        attempt += 1
 
 
 def download_image(
     url: str,
-    target_folder: Path,
+    target_folder: str | os.PathLike,
     dt_obj: datetime,
     do_exif: bool
 ) -> DownloadResult:
     """
-    Download a single image to target_folder.
+    Download a single image to target_folder, which the caller must have created.
     Skips if file already exists (optionally updates EXIF).
+    Safe to call from several worker threads, as long as no two concurrent
+    calls target the same save path (see process_folder()).
     Rejects files smaller than MIN_IMAGE_SIZE to filter out broken images.
 
     Delay behaviour:
-        - Every successful download sleeps DELAY_BETWEEN_REQUESTS afterward.
-        - HTTP 429 response sleeps BACKOFF_ON_429 (replaces normal delay).
-        - REPEAT_FAIL_THRESHOLD consecutive failures from same domain
-          sleeps BACKOFF_ON_REPEAT_FAIL (replaces normal delay).
+        - Every request (including retries) takes a token from the shared
+          DOWNLOAD_RATE bucket, capping the request rate of the whole run.
+        - HTTP 429 response defers its domain by Retry-After, or exponential
+          backoff from BACKOFF_BASE, then retries.
+        - REPEAT_FAIL_THRESHOLD consecutive failures from same domain defer it:
+          transient ones (408 / 5xx, timeout, connection error) by exponential
+          backoff from BACKOFF_BASE, others by a flat BACKOFF_ON_REPEAT_FAIL.
+        - HTTP 404 / 410 (image gone) never defers the domain.
+        - At most MAX_DOWNLOADS_PER_HOST downloads run against one domain at once.
+        - Host slots are taken per request attempt, after the domain's backoff
+          has been waited out, so a backoff never holds one. The waiting worker
+          thread itself is still busy: many queued jobs for one backed-off
+          domain can occupy the whole download pool and so delay other domains.
         - Skipped files (already exist) have no delay — no request was made.
 
     Returns a DownloadResult dataclass.
@@ -126,68 +434,116 @@ def download_image(
         return DownloadResult(skipped=True)
 
     # Extract filename from URL, strip query string
-    raw_name = url.split('/')[-1].split('?')[0]
-    file_name = Path(raw_name).name  # strip any directory components (defence-in-depth)
+    raw_name = url_file_name(url)
+    file_name = os.path.basename(raw_name)  # strip any directory components (defence-in-depth)
 
     if not file_name:
         logger.warning(f"download skipped (empty filename after sanitisation): {url}")
         return DownloadResult(skipped=True)
 
-    save_path = target_folder / file_name
-    target_folder.mkdir(exist_ok=True, parents=True)
+    # Plain string paths from here on — this runs once per image, and no
+    # caller needs a Path object back
+    save_path = os.path.join(os.fspath(target_folder), file_name)
 
     # File already exists — skip download, optionally update EXIF
     # No delay applied: no network request was made
-    if save_path.exists():
-        logger.debug(f"skip (exists): {file_name}")
+    if os.path.exists(save_path):
+        logger.debug("skip (exists): %s", file_name)
         exif_updated = write_exif_time(save_path, dt_obj) if do_exif else False
         return DownloadResult(skipped=True, exif_updated=exif_updated)
 
     domain = _extract_domain(url)
-    logger.debug(f"attempting download: {url}")
+    logger.debug("attempting download: %s", url)
 
     try:
-        res = requests.get(url, timeout=15)
-
-        # 429 Too Many Requests — server is explicitly rate limiting us
-        # Apply dedicated backoff, do not add normal delay on top
-        if res.status_code == 429:
-            logger.warning(
-                f"HTTP 429 Too Many Requests — backing off {BACKOFF_ON_429}s: {url}"
-            )
-            _domain_fail_count[domain] = _domain_fail_count.get(domain, 0) + 1
-            time.sleep(BACKOFF_ON_429)
-            return DownloadResult(failed=True)
-
-        # Other non-200 response — likely deleted or moved image
-        if res.status_code != 200:
-            logger.warning(f"download failed (HTTP {res.status_code}): {url}")
-            _record_failure(domain)
-            return DownloadResult(failed=True)
-
-        # File too small — likely a residual thumbnail or placeholder returned as 200.
-        # This is our own content filter decision, not a server rejection or error.
-        # Returned as skipped=True (not failed) because:
-        #   - The server responded correctly
-        #   - No backoff should be triggered
-        #   - It folds into the '略過已存在/過小圖片' stat alongside existing files,
-        #     which is accurate — both are intentional non-downloads, not failures
-        # Do NOT call _record_failure() here.
-        if len(res.content) <= MIN_IMAGE_SIZE:
-            logger.debug(
-                f"download skipped (size {len(res.content)}B <= {MIN_IMAGE_SIZE}B): {url}"
-            )
-            return DownloadResult(skipped=True)
-
-        # Write file to disk
-        with open(save_path, "wb") as f:
-            f.write(res.content)
-
-        logger.debug(f"downloaded OK ({len(res.content)}B): {file_name}")
-
-        exif_updated = write_exif_time(save_path, dt_obj) if do_exif else False
-
-        # Success — reset domain fail count and apply polite delay
+        # stream=True: the body is read chunk by chunk below and written straight
+        # to disk, instead of being materialised in memory as res.content first
+        # _get_with_retry() sits out any backoff on the domain before taking one
+        # of its host slots, and holds the slot until the body is on disk, so at
+        # most MAX_DOWNLOADS_PER_HOST transfers from one host overlap
+        with _get_with_retry(url, domain) as res:
+
+            # 429 Too Many Requests on every attempt — server is explicitly rate
+            # limiting us. Backoff was already applied by _get_with_retry().
+            if res.status_code == 429:
+                logger.warning(
+                    f"download failed (HTTP 429 after {MAX_RETRIES_ON_429} retries): {url}"
+                )
+                return DownloadResult(failed=True)
+
+            # Other non-200 response — likely deleted or moved image.
+            # A gone image is no sign of trouble with the host: no backoff.
+            if res.status_code != 200:
+                logger.warning(f"download failed (HTTP {res.status_code}): {url}")
+                _discard_body(res)
+                if res.status_code not in GONE_STATUS_CODES:
+                    _record_failure(domain, transient=_is_transient_status(res.status_code))
+                return DownloadResult(failed=True)
+
+            # Server already announced a body too small to keep — reject it from
+            # the headers alone (see the size filter note below).
+            declared = _declared_length(res)
+            if declared is not None and declared <= MIN_IMAGE_SIZE:
+                logger.debug(
+                    "download skipped (Content-Length %dB <= %dB): %s", declared, MIN_IMAGE_SIZE, url
+                )
+                _discard_body(res)
+                return DownloadResult(skipped=True)
+
+            # Buffer only enough of the body to decide on MIN_IMAGE_SIZE.
+            # Covers responses without a usable Content-Length (chunked / encoded).
+            # Tiny placeholders are rejected here without ever touching the disk.
+            chunks = res.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE)
+            head = b""
+            for chunk in chunks:
+                head += chunk
+                if len(head) > MIN_IMAGE_SIZE:
+                    break
+
+            # File too small — likely a residual thumbnail or placeholder returned as 200.
+            # This is our own content filter decision, not a server rejection or error.
+            # Returned as skipped=True (not failed) because:
+            #   - The server responded correctly
+            #   - No backoff should be triggered
+            #   - It folds into the '略過已存在/過小圖片' stat alongside existing files,
+            #     which is accurate — both are intentional non-downloads, not failures
+            # Do NOT call _record_failure() here.
+            if len(head) <= MIN_IMAGE_SIZE:
+                logger.debug(
+                    "download skipped (size %dB <= %dB): %s", len(head), MIN_IMAGE_SIZE, url
+                )
+                return DownloadResult(skipped=True)
+
+            # Stream the rest of the body into a sibling .part file, then move it
+            # into place with an atomic os.replace(). save_path therefore only
+            # ever exists as a complete file: a transfer cut off mid-way — or a
+            # crash or force-kill — can never leave a truncated image that the
+            # next run would treat as already downloaded.
+            # Opening with "wb" also truncates any stale .part left by a killed run.
+            # No two workers share a save path (see process_folder()), so the
+            # .part name needs no further locking.
+            tmp_path = save_path + PARTIAL_SUFFIX
+            total = len(head)
+            try:
+                with open(tmp_path, "wb", buffering=WRITE_BUFFER_SIZE) as f:
+                    f.write(head)
+                    for chunk in chunks:
+                        f.write(chunk)
+                        total += len(chunk)
+                os.replace(tmp_path, save_path)
+            except BaseException:
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(tmp_path)
+                raise
+
+        logger.debug("downloaded OK (%dB): %s", total, file_name)
+
+        # EXIF is written here on the download worker, after the response has
+        # been closed and its connection returned to the pool — so it already
+        # overlaps the network I/O of the other workers and needs no pool of its own.
+        exif_updated = write_exif_time(save_path, dt_obj, fresh=True) if do_exif else False
+
+        # Success — reset domain fail count
         _record_success(domain)
         return DownloadResult(downloaded=True, exif_updated=exif_updated)
 
@@ -197,11 +553,17 @@ def download_image(
     except requests.exceptions.ConnectionError as e:
         logger.error(f"download connection error: {url} — {e}")
         _record_failure(domain)
+    except requests.exceptions.RequestException as e:
+        # Must precede OSError: RequestException subclasses IOError, and errors
+        # raised while streaming the body (e.g. ChunkedEncodingError) are network
+        # problems, not local disk issues
+        logger.error(f"download request error: {url} — {type(e).__name__}: {e}")
+        _record_failure(domain)
     except OSError as e:
         logger.error(f"file write error: {save_path} — {e}")
         # OSError is a local disk issue, not a domain issue — do not penalise domain
     except Exception as e:
         logger.error(f"download unexpected error: {url} — {type(e).__name__}: {e}")
-        _record_failure(domain)
+        _record_failure(domain, transient=False)
 
     return DownloadResult(failed=True)
@@ -2,8 +2,11 @@
 # Licensed under Apache License 2.0 (Non-Commercial Use Only)
 # Disclaimer: Use at your own risk. The author is not responsible for any damages.
 
+import io
+import os
+import struct
 from datetime import datetime
-from pathlib import Path
+from functools import lru_cache
 
 from core.logger import get_logger
 
@@ -17,26 +20,251 @@ except ImportError:
     PIEXIF_AVAILABLE = False
 
 
+# File extensions write_exif_time() handles (compared lower-cased)
+_JPEG_EXTS = (".jpg", ".jpeg")
+
+
 def is_exif_available() -> bool:
     """Return whether piexif module is installed and available."""
     return PIEXIF_AVAILABLE
 
 
-def write_exif_time(file_path: Path, dt_obj: datetime) -> bool:
+# ==========================================
+# Pre-built EXIF segment for the fresh-write path
+# ==========================================
+# A complete APP1 segment holding only the three timestamp fields, laid out
+# by hand (big-endian TIFF) so fresh downloads never go through piexif.dump():
+#
+#   segment  TIFF   content
+#   0        -      FF E1 marker + 2-byte segment length
+#   4        -      "Exif\0\0"
+#   10       0      TIFF header "MM", 42, offset of IFD0 (8)
+#   18       8      IFD0: DateTime (0x0132), ExifIFD pointer (0x8769)
+#   48       38     DateTime value
+#   68       58     Exif IFD: DateTimeOriginal (0x9003), DateTimeDigitized (0x9004)
+#   98       88     DateTimeOriginal value
+#   118      108    DateTimeDigitized value
+#
+# Each timestamp is an ASCII "YYYY:MM:DD HH:MM:SS" string plus NUL (20 bytes).
+_EXIF_TIME_LENGTH = 19
+
+
+@lru_cache(maxsize=1024)
+def _fmt_exif_ts(dt_obj: datetime) -> str:
     """
-    Write or correct the EXIF timestamp of a JPEG file.
-    Only updates if the existing timestamp is missing or inconsistent.
-    Skips non-JPEG files and when piexif is unavailable.
-    Returns True if EXIF was written/updated, False otherwise.
+    Format dt_obj as an EXIF timestamp string.
+    Cached — every image of one plurk shares the same datetime, so strftime()
+    runs once per plurk instead of once per image.
+    """
+    return dt_obj.strftime("%Y:%m:%d %H:%M:%S")
+
+
+def _ifd_entry(tag: int, field_type: int, count: int, value: int) -> bytes:
+    """Pack one 12-byte big-endian IFD entry."""
+    return struct.pack(">HHII", tag, field_type, count, value)
+
+
+def _build_exif_template() -> tuple[bytes, tuple[int, ...]]:
+    """
+    Build the timestamp-only APP1 segment with blank time values.
+    Returns the segment and the offsets of its three time value slots.
+    """
+    ascii_type, long_type = 2, 4
+    time_size = _EXIF_TIME_LENGTH + 1
+    ifd0_offset = 8
+    datetime_offset = ifd0_offset + 2 + 2 * 12 + 4
+    exif_ifd_offset = datetime_offset + time_size
+    original_offset = exif_ifd_offset + 2 + 2 * 12 + 4
+    digitized_offset = original_offset + time_size
+
+    tiff = b"".join((
+        b"MM", struct.pack(">HI", 42, ifd0_offset),
+        struct.pack(">H", 2),
+        _ifd_entry(0x0132, ascii_type, time_size, datetime_offset),
+        _ifd_entry(0x8769, long_type, 1, exif_ifd_offset),
+        struct.pack(">I", 0),
+        bytes(time_size),
+        struct.pack(">H", 2),
+        _ifd_entry(0x9003, ascii_type, time_size, original_offset),
+        _ifd_entry(0x9004, ascii_type, time_size, digitized_offset),
+        struct.pack(">I", 0),
+        bytes(time_size) * 2,
+    ))
+    payload = b"Exif\x00\x00" + tiff
+    segment = b"\xff\xe1" + struct.pack(">H", len(payload) + 2) + payload
+
+    tiff_start = 10
+    slots = (datetime_offset, original_offset, digitized_offset)
+    return segment, tuple(tiff_start + slot for slot in slots)
+
+
+_EXIF_TEMPLATE, _EXIF_TIME_SLOTS = _build_exif_template()
+
+
+def _fresh_exif_segment(target_time_str: str) -> bytes:
+    """Return the pre-built APP1 segment with target_time_str filled into all three slots."""
+    value = target_time_str.encode("ascii")
+    if len(value) != _EXIF_TIME_LENGTH:
+        raise ValueError(f"unexpected EXIF timestamp format: {target_time_str!r}")
+
+    segment = bytearray(_EXIF_TEMPLATE)
+    for slot in _EXIF_TIME_SLOTS:
+        segment[slot:slot + _EXIF_TIME_LENGTH] = value
+    return bytes(segment)
+
+
+def _splice_exif_segment(segment: bytes, image_data: bytes) -> bytes:
+    """
+    Return image_data with segment placed right after SOI.
+    Mirrors piexif.insert(): a leading APP0 (JFIF) segment and/or a leading
+    Exif APP1 segment are replaced, everything after them is kept as-is.
+    """
+    if image_data[:2] != b"\xff\xd8":
+        raise ValueError("not a JPEG file (missing SOI marker)")
+
+    head = 2
+    if image_data[head:head + 2] == b"\xff\xe0":
+        head += 2 + struct.unpack(">H", image_data[head + 2:head + 4])[0]
+    if image_data[head:head + 2] == b"\xff\xe1" and image_data[head + 4:head + 10] == b"Exif\x00\x00":
+        head += 2 + struct.unpack(">H", image_data[head + 2:head + 4])[0]
+
+    return b"".join((image_data[:2], segment, image_data[head:]))
+
+
+def _has_exif_data(exif_dict: dict) -> bool:
+    """Return whether a piexif.load() result holds any existing EXIF fields."""
+    return bool(exif_dict.get("thumbnail")) or any(
+        exif_dict.get(ifd) for ifd in ("0th", "Exif", "GPS", "Interop", "1st")
+    )
+
+
+def _write_bytes(path: str, data: bytes) -> None:
+    """Write data to path in a single call."""
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def _insert_exif(exif_bytes: bytes, image_data: bytes) -> bytes:
+    """
+    Return image_data with exif_bytes spliced in.
+    The new JPEG is assembled in memory so the caller can write it back
+    to disk in a single call instead of letting piexif reopen the file.
     """
-    # Skip non-JPEG files silently — expected behaviour, no log needed
-    if not PIEXIF_AVAILABLE or file_path.suffix.lower() not in ['.jpg', '.jpeg']:
+    buf = io.BytesIO()
+    piexif.insert(exif_bytes, image_data, buf)
+    return buf.getvalue()
+
+
+# How far into a file to look for an existing EXIF APP1 segment when a freshly
+# downloaded file is written. The segment sits right after SOI (or a short APP0),
+# so a small window is enough.
+EXIF_PROBE_SIZE = 4096
+
+# How much of an existing file to read when checking whether it already
+# carries the target timestamp. 64KB covers the APP1 segment of nearly every
+# JPEG, including camera EXIF with an embedded thumbnail.
+EXIF_HEAD_PROBE_SIZE = 65536
+
+# TIFF tags the head probe follows from IFD0 to DateTimeOriginal
+_TAG_EXIF_IFD = 0x8769
+_TAG_DATETIME_ORIGINAL = 0x9003
+
+
+def _find_ifd_entry(head: bytes, tiff_start: int, endian: str, ifd_offset: int, tag: int) -> int | None:
+    """
+    Return the position in head of tag's 12-byte entry in the IFD at
+    ifd_offset (relative to tiff_start), or None if the IFD has no such tag.
+    Raises struct.error if the IFD runs past the end of head.
+    """
+    pos = tiff_start + ifd_offset
+    (count,) = struct.unpack_from(endian + "H", head, pos)
+    for entry in range(pos + 2, pos + 2 + 12 * count, 12):
+        (entry_tag,) = struct.unpack_from(endian + "H", head, entry)
+        if entry_tag == tag:
+            return entry
+    return None
+
+
+def _head_original_time(head: bytes, exif_pos: int) -> bytes | None:
+    """
+    Return the DateTimeOriginal value of the Exif APP1 segment whose
+    "Exif\0\0" header starts at exif_pos in head, without the trailing NUL.
+    Follows IFD0 -> Exif IFD -> DateTimeOriginal only, so a matching DateTime,
+    DateTimeDigitized or thumbnail byte run is never mistaken for it.
+    Returns None if the tag is missing, malformed, or lies beyond head —
+    the caller then falls back to a full piexif.load().
+    """
+    if exif_pos < 4 or head[exif_pos - 4:exif_pos - 2] != b"\xff\xe1":
+        return None
+
+    tiff_start = exif_pos + 6
+    byte_order = head[tiff_start:tiff_start + 2]
+    if byte_order == b"MM":
+        endian = ">"
+    elif byte_order == b"II":
+        endian = "<"
+    else:
+        return None
+
+    try:
+        magic, ifd0_offset = struct.unpack_from(endian + "HI", head, tiff_start + 2)
+        if magic != 42:
+            return None
+
+        pointer = _find_ifd_entry(head, tiff_start, endian, ifd0_offset, _TAG_EXIF_IFD)
+        if pointer is None:
+            return None
+        (exif_ifd_offset,) = struct.unpack_from(endian + "I", head, pointer + 8)
+
+        entry = _find_ifd_entry(head, tiff_start, endian, exif_ifd_offset, _TAG_DATETIME_ORIGINAL)
+        if entry is None:
+            return None
+        field_type, count = struct.unpack_from(endian + "HI", head, entry + 2)
+        if field_type != 2:  # ASCII
+            return None
+
+        # Values of up to 4 bytes sit in the entry itself, longer ones at an offset
+        if count <= 4:
+            value_pos = entry + 8
+        else:
+            (value_pos,) = struct.unpack_from(endian + "I", head, entry + 8)
+            value_pos += tiff_start
+        if value_pos + count > len(head):
+            return None
+        return head[value_pos:value_pos + count].rstrip(b"\x00")
+
+    except struct.error:
+        return None
+
+
+def _write_fresh_exif(path: str, image_data: bytes, target_time_str: str) -> bool:
+    """
+    Write a new timestamp-only EXIF block, replacing any existing one.
+    Uses the pre-built segment — no piexif.load() or piexif.dump() — so it is
+    only used when there is no existing EXIF worth preserving.
+    Returns True on success, False if the write failed.
+    """
+    try:
+        _write_bytes(path, _splice_exif_segment(_fresh_exif_segment(target_time_str), image_data))
+        logger.debug("exif fresh write OK (%s): %s", target_time_str, os.path.basename(path))
+        return True
+
+    except Exception as e:
+        # Complete EXIF write failure — file may be locked or corrupted
+        logger.error(
+            f"exif write failed completely: {os.path.basename(path)} — {type(e).__name__}: {e}"
+        )
         return False
 
-    target_time_str = dt_obj.strftime("%Y:%m:%d %H:%M:%S")
 
+def _update_exif_if_wrong(path: str, image_data: bytes, target_time_str: str) -> bool:
+    """
+    Load the existing EXIF block and rewrite the timestamp fields only if they
+    are missing or inconsistent, keeping every other existing field.
+    Returns True if EXIF was written/updated, False otherwise.
+    """
     try:
-        exif_dict = piexif.load(str(file_path))
+        exif_dict = piexif.load(image_data)
 
         # Read existing DateTimeOriginal field
         current_time = exif_dict.get("Exif", {}).get(piexif.ExifIFD.DateTimeOriginal)
@@ -44,38 +272,76 @@ def write_exif_time(file_path: Path, dt_obj: datetime) -> bool:
 
         # Skip if timestamp is already correct
         if current_time_str == target_time_str:
-            logger.debug(f"exif already correct, skipping: {file_path.name}")
+            logger.debug("exif already correct, skipping: %s", os.path.basename(path))
             return False
 
-        # Update all three EXIF time fields for consistency
+        # No existing EXIF to preserve — use the pre-built timestamp-only segment
+        if not _has_exif_data(exif_dict):
+            _write_bytes(path, _splice_exif_segment(_fresh_exif_segment(target_time_str), image_data))
+            logger.debug("exif written (%s): %s", target_time_str, os.path.basename(path))
+            return True
+
+        # Update all three EXIF time fields for consistency, keeping the rest
         exif_dict["0th"][piexif.ImageIFD.DateTime] = target_time_str
         exif_dict["Exif"][piexif.ExifIFD.DateTimeOriginal] = target_time_str
         exif_dict["Exif"][piexif.ExifIFD.DateTimeDigitized] = target_time_str
-        piexif.insert(piexif.dump(exif_dict), str(file_path))
+        _write_bytes(path, _insert_exif(piexif.dump(exif_dict), image_data))
 
-        logger.debug(f"exif updated ({target_time_str}): {file_path.name}")
+        logger.debug("exif updated (%s): %s", target_time_str, os.path.basename(path))
         return True
 
     except Exception as e:
         # Existing EXIF block is malformed or missing — fall back to writing a new block
         logger.warning(
-            f"exif load failed, attempting fresh write: {file_path.name} — {type(e).__name__}: {e}"
+            f"exif load failed, attempting fresh write: {os.path.basename(path)} — {type(e).__name__}: {e}"
         )
-        try:
-            new_exif = {
-                "0th":  {piexif.ImageIFD.DateTime: target_time_str},
-                "Exif": {
-                    piexif.ExifIFD.DateTimeOriginal:  target_time_str,
-                    piexif.ExifIFD.DateTimeDigitized: target_time_str,
-                }
-            }
-            piexif.insert(piexif.dump(new_exif), str(file_path))
-            logger.debug(f"exif fresh write OK ({target_time_str}): {file_path.name}")
-            return True
+        return _write_fresh_exif(path, image_data, target_time_str)
 
-        except Exception as e2:
-            # Complete EXIF write failure — file may be locked or corrupted
-            logger.error(
-                f"exif write failed completely: {file_path.name} — {type(e2).__name__}: {e2}"
-            )
-            return False
+
+def write_exif_time(file_path: str | os.PathLike, dt_obj: datetime, fresh: bool = False) -> bool:
+    """
+    Write or correct the EXIF timestamp of a JPEG file.
+    Only updates if the existing timestamp is missing or inconsistent.
+    Skips non-JPEG files and when piexif is unavailable.
+
+    fresh: pass True for a file that was just downloaded. Unless the file
+           carries its own EXIF segment, the timestamp block is then written
+           directly, skipping the piexif.load() parse of the whole file.
+
+    Returns True if EXIF was written/updated, False otherwise.
+    """
+    # Work on the plain path string — this runs once per image, and nothing
+    # below needs a Path object
+    path = os.fspath(file_path)
+
+    # Skip non-JPEG files silently — expected behaviour, no log needed.
+    # Only the last 5 characters are lowered, enough to cover ".jpeg".
+    if not PIEXIF_AVAILABLE or not path[-5:].lower().endswith(_JPEG_EXTS):
+        return False
+
+    target_time_str = _fmt_exif_ts(dt_obj)
+
+    # Read the file once — both the EXIF load and the rewrite work on these bytes.
+    # The head is read first: on re-runs the file usually already carries the
+    # timestamp we wrote last time, which the head probe confirms from the
+    # DateTimeOriginal entry without reading the rest of the file or running
+    # piexif.load(). Anything the probe cannot read goes the full way below.
+    try:
+        with open(path, "rb") as f:
+            head = f.read(EXIF_HEAD_PROBE_SIZE)
+            exif_pos = head.find(b"Exif\x00\x00")
+            if exif_pos != -1 and _head_original_time(head, exif_pos) == target_time_str.encode("ascii"):
+                logger.debug("exif already correct, skipping: %s", os.path.basename(path))
+                return False
+            image_data = head + f.read()
+    except OSError as e:
+        logger.error(f"exif write failed, cannot read file: {os.path.basename(path)} — {e}")
+        return False
+
+    # Plurk strips EXIF from uploads, so a fresh download normally has nothing
+    # to preserve. Images from other hosts may still carry camera EXIF — those
+    # go through the load-and-merge path like existing files do.
+    if fresh and b"Exif\x00\x00" not in image_data[:EXIF_PROBE_SIZE]:
+        return _write_fresh_exif(path, image_data, target_time_str)
+
+    return _update_exif_if_wrong(path, image_data, target_time_str)
@@ -12,14 +12,23 @@ Centralized singleton logger for plurk-image-dl-ct.
 - Log files are written to <program_folder>/log/session_YYYYMMDD_HHMMSS.log
 - Works in both script mode and PyInstaller frozen .exe mode.
 
-Buffering strategy:
-  The file is opened in line-buffered mode (buffering=1).
-  This means every log line is flushed to disk immediately after being written,
-  rather than accumulating in an 8KB memory buffer first.
-  Trade-off: slightly more disk write operations, but each line is guaranteed
-  on disk before the next one is written — critical for crash/kill scenarios
-  where a full-buffer flush would never happen.
-  Performance impact is negligible since the bottleneck is network I/O, not disk.
+Write strategy:
+  Log calls never touch the file directly. The shared logger carries a
+  QueueHandler that only formats the record and puts it on an in-memory queue;
+  a QueueListener thread drains the queue into a FileHandler.
+  This keeps disk writes (and any disk stall) off the download worker threads,
+  which log several DEBUG lines per image.
+  The FileHandler flushes after every record it writes, so lines still reach
+  the OS as soon as the listener picks them up. shutdown_logger() and an
+  atexit hook stop the listener, which drains every queued record first —
+  only a hard kill can lose the last few lines still waiting in the queue.
+
+Worker processes:
+  Code running in a worker process (see core/processor.py) has no file handler
+  of its own. start_worker_log_forwarding() creates a process-safe queue and a
+  listener that feeds the records it receives back into the shared logger;
+  init_worker_logging() is the pool initializer that points each worker
+  process's logger at that queue.
 
 Log retention:
   setup_logger() keeps the most recent MAX_SESSION_LOGS session files.
@@ -28,9 +37,13 @@ Log retention:
   The cleanup message is returned to the caller for display in the UI or CLI.
 """
 
+import atexit
 import logging
+import multiprocessing
 import platform
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime
 from pathlib import Path
 
@@ -40,6 +53,10 @@ _LOGGER_NAME = "plurk_dl"
 # Tracks whether setup_logger() has already been called
 _initialized = False
 
+# Background listener that writes queued records to the session file.
+# Set by setup_logger(), cleared by _stop_listener().
+_listener: QueueListener | None = None
+
 # Maximum number of session log files to keep on disk.
 # When exceeded, the oldest files are deleted at the next launch.
 MAX_SESSION_LOGS = 20
@@ -136,8 +153,8 @@ def setup_logger(mode: str = "GUI") -> tuple[Path, str | None]:
     Behaviour:
         - Creates <program_folder>/log/ if it does not exist.
         - Names the file session_YYYYMMDD_HHMMSS.log.
-        - Opens the file in line-buffered mode (buffering=1) so every line
-          is written to disk immediately — safe against crashes and force-kills.
+        - Attaches a QueueHandler to the shared logger and starts a QueueListener
+          thread that writes the queued records to the file (see module docstring).
         - Writes a session header block as the first entry.
         - Runs log retention cleanup (keeps MAX_SESSION_LOGS most recent files).
         - Subsequent calls are no-ops (returns the existing log path and None).
@@ -161,25 +178,32 @@ def setup_logger(mode: str = "GUI") -> tuple[Path, str | None]:
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     log_path = log_folder / f"session_{timestamp}.log"
 
-    # Open file in line-buffered mode (buffering=1):
-    # Each log line is flushed to disk immediately after writing.
-    # Default FileHandler would buffer ~8KB in memory before flushing —
-    # meaning the last N lines before a crash or force-kill could be lost.
-    log_file = open(log_path, "a", encoding="utf-8", buffering=1)
-    file_handler = logging.StreamHandler(log_file)
+    # File handler — only ever called from the listener thread
+    file_handler = logging.FileHandler(log_path, mode="a", encoding="utf-8")
     file_handler.setLevel(logging.DEBUG)
 
-    # Store the file object reference for clean shutdown later
-    file_handler._log_file = log_file
-    file_handler._log_path = str(log_path)
-
     # Log format: timestamp [LEVEL ] [module] message
     formatter = logging.Formatter(
         fmt="%(asctime)s [%(levelname)-5s] [%(module)s] %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
     )
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+
+    # Queue handler — what log calls actually hit; cheap enqueue, no disk I/O
+    log_queue: queue.Queue = queue.Queue(-1)
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setLevel(logging.DEBUG)
+
+    # Store the log path for _get_existing_log_path()
+    queue_handler._log_path = str(log_path)
+    logger.addHandler(queue_handler)
+
+    global _listener
+    _listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    _listener.start()
+
+    # Drain queued records even on exit paths that skip shutdown_logger()
+    atexit.register(_stop_listener)
 
     # Write session header as first log entry
     header = _build_session_header(log_path, mode)
@@ -192,6 +216,25 @@ def setup_logger(mode: str = "GUI") -> tuple[Path, str | None]:
     return log_path, cleanup_msg
 
 
+def _stop_listener() -> None:
+    """
+    Stop the queue listener, writing out every record still queued,
+    then close its file handler. Safe to call more than once.
+    """
+    global _listener
+
+    if _listener is None:
+        return
+
+    listener, _listener = _listener, None
+    listener.stop()
+    for handler in listener.handlers:
+        try:
+            handler.close()
+        except Exception:
+            pass
+
+
 def shutdown_logger(reason: str = "normal") -> None:
     """
     Flush and close the log file cleanly before the app exits.
@@ -209,18 +252,57 @@ def shutdown_logger(reason: str = "normal") -> None:
     logger = logging.getLogger(_LOGGER_NAME)
     logger.info(f"--- Session ended ({reason}) ---")
 
-    # Flush and close all handlers, then remove them from the logger
+    # Drain the queue into the file and close it before detaching handlers
+    _stop_listener()
+
+    # Close all handlers, then remove them from the logger
     for handler in logger.handlers[:]:
         try:
-            handler.flush()
-            if hasattr(handler, "_log_file"):
-                handler._log_file.close()
             handler.close()
         except Exception:
             pass
         logger.removeHandler(handler)
 
 
+class _ForwardToLogger(logging.Handler):
+    """Handler that passes records received from worker processes to the shared logger."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        logging.getLogger(_LOGGER_NAME).handle(record)
+
+
+def start_worker_log_forwarding(context) -> tuple[multiprocessing.Queue, QueueListener]:
+    """
+    Start forwarding log records from worker processes into the shared logger.
+
+    Args:
+        context: the multiprocessing context the worker processes are started from.
+
+    Returns:
+        (log_queue, listener) where:
+          log_queue: pass to init_worker_logging() as the pool initializer argument.
+          listener:  call listener.stop() once the worker processes have exited;
+                     it writes out every record still queued before returning.
+    """
+    log_queue = context.Queue(-1)
+    listener = QueueListener(log_queue, _ForwardToLogger())
+    listener.start()
+    return log_queue, listener
+
+
+def init_worker_logging(log_queue: multiprocessing.Queue) -> None:
+    """
+    Pool initializer for worker processes: send every record logged through the
+    shared logger to log_queue, where the parent's listener picks it up.
+    Replaces any handler inherited from the parent process.
+    """
+    logger = logging.getLogger(_LOGGER_NAME)
+    for handler in logger.handlers[:]:
+        logger.removeHandler(handler)
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(QueueHandler(log_queue))
+
+
 def get_logger() -> logging.Logger:
     """
     Return the shared logger instance.
@@ -235,7 +317,7 @@ def get_logger() -> logging.Logger:
 
 def _get_existing_log_path(logger: logging.Logger) -> Path:
     """
-    Retrieve the log file path from an already-initialized logger's StreamHandler.
+    Retrieve the log file path from an already-initialized logger's QueueHandler.
     Returns a fallback Path if no handler with a stored path is found.
     """
     for handler in logger.handlers:
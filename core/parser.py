@@ -2,17 +2,89 @@
 # Licensed under Apache License 2.0 (Non-Commercial Use Only)
 # Disclaimer: Use at your own risk. The author is not responsible for any damages.
 
-import re
 import json
+from functools import lru_cache
 from pathlib import Path
+from typing import Iterator
 
 from core.logger import get_logger
 
 logger = get_logger()
 
-# Regex: exclude official Plurk stickers, match general image files
-PLURK_EMOJI_PATTERN = re.compile(r'https://images\.plurk\.com/mx_')
-GENERAL_IMAGE_PATTERN = re.compile(r'https?://[^\s"\'\\]+\.(?:jpg|png|gif|jpeg)', re.IGNORECASE)
+# Try to import google-re2, make it optional.
+# RE2 matches in linear time on any input, so findall() over long, user-supplied
+# post content can never hit a catastrophic backtracking case. Both patterns
+# below only use syntax RE2 supports; without it the stdlib engine is used.
+try:
+    import re2 as _re_engine
+    RE2_AVAILABLE = True
+except ImportError:
+    import re as _re_engine
+    RE2_AVAILABLE = False
+
+# Try to import orjson, make it optional.
+# Decodes the JSON array several times faster than the stdlib json module;
+# without it (or for files it rejects) the stdlib decoder is used.
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Regex: match general image files
+# Case-insensitivity is set inline with (?i), so both engines compile the
+# same pattern string without engine-specific flags.
+# '<' and '>' end the URL run, so a URL directly followed by HTML markup
+# (e.g. "x.jpg<br>") neither swallows the tag nor backtracks through it.
+GENERAL_IMAGE_PATTERN = _re_engine.compile(r'(?i)https?://[^\s"\'\\<>]+\.(?:jpe?g|png|gif)')
+
+# Regex: URLs matched by GENERAL_IMAGE_PATTERN that are not worth downloading.
+# One alternation compiled once, so each URL is filtered by a single search().
+SKIP_PATTERN = _re_engine.compile(
+    # Plurk system image domains (UI chrome, not user content)
+    r'(?i)emos\.plurk\.com|static\.plurk\.com'
+    # Plurk user avatars — these are account profile pictures embedded
+    # as preview thumbnails in linked plurk HTML, not actual post content images.
+    # They consistently fail MIN_IMAGE_SIZE and are never worth downloading.
+    r'|avatars\.plurk\.com'
+    # Plurk emoticons served from s.plurk.com/emoticons — tiny GIFs
+    # (basic, silver, gold, platinum tiers). Same rationale as emos.plurk.com —
+    # Plurk's emoticon CDN, not user-uploaded content.
+    r'|s\.plurk\.com/emoticons'
+    # Plurk auto-generated medium thumbnails (_mt suffix).
+    # Plurk generates _mt.jpg as a smaller version of every uploaded image.
+    # The full-size original (without _mt) is the version worth downloading
+    # and will be captured separately from the same post content.
+    r'|imgs\.plurk\.com/.*_mt\.jpg'
+    # YouTube default thumbnails (120x90px, ~3-5KB) — always too small.
+    # Only filter the 'default.jpg' variant to preserve larger thumbnails
+    # (mqdefault, hqdefault, maxresdefault) in case they are ever linked directly.
+    # Anchored on '/' — a bare 'default.jpg' would match those variants too.
+    r'|i\.ytimg\.com/.*/default\.jpg'
+    # Official Plurk stickers (mx_ prefix)
+    r'|images\.plurk\.com/mx_'
+)
+
+
+# Byte values trimmed around the JSON array in parse_js_content()
+_WHITESPACE = frozenset(b" \t\r\n")
+_SEMICOLON = ord(";")
+
+
+def _decode_json(raw: bytes, start: int, end: int):
+    """
+    Decode the JSON document in raw[start:end].
+    orjson reads it through a memoryview, without copying the slice. It is
+    always strict, so input it rejects — e.g. raw control characters inside
+    strings — is retried with the stdlib decoder in strict=False mode.
+    Raises json.JSONDecodeError if neither decoder accepts the input.
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(memoryview(raw)[start:end])
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(raw[start:end], strict=False)
 
 
 def parse_js_content(file_path: Path) -> list:
@@ -22,30 +94,39 @@ def parse_js_content(file_path: Path) -> list:
     Returns empty list on any failure.
     """
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            raw_text = f.read().strip()
-
-            # Find the '=' sign to locate the JSON array
-            eq_index = raw_text.find('=')
-            if eq_index == -1:
-                logger.warning(f"parse_js_content: no '=' found in file — {file_path}")
-                return []
-
-            json_part = raw_text[eq_index + 1:].strip()
-
-            # Remove trailing semicolon if present
-            if json_part.endswith(';'):
-                json_part = json_part[:-1].strip()
-
-            result = json.loads(json_part, strict=False)
-
-            # Only return if result is a list of dicts (plurks/responses format)
-            if not isinstance(result, list):
-                logger.warning(f"parse_js_content: parsed result is not a list ({type(result).__name__}) — {file_path}")
-                return []
-
-            logger.debug(f"parse_js_content: OK — {file_path.name} ({len(result)} items)")
-            return result
+        # Read raw bytes — both JSON decoders take UTF-8 bytes directly, so the
+        # whole file is never held as both a decoded string and a stripped copy of it
+        with open(file_path, "rb") as f:
+            raw = f.read()
+
+        # Find the '=' sign to locate the JSON array
+        eq_index = raw.find(b'=')
+        if eq_index == -1:
+            logger.warning(f"parse_js_content: no '=' found in file — {file_path}")
+            return []
+
+        # Trim surrounding whitespace and a trailing semicolon by moving the
+        # slice bounds instead of copying the file
+        start = eq_index + 1
+        end = len(raw)
+        while start < end and raw[start] in _WHITESPACE:
+            start += 1
+        while end > start and raw[end - 1] in _WHITESPACE:
+            end -= 1
+        if end > start and raw[end - 1] == _SEMICOLON:
+            end -= 1
+            while end > start and raw[end - 1] in _WHITESPACE:
+                end -= 1
+
+        result = _decode_json(raw, start, end)
+
+        # Only return if result is a list of dicts (plurks/responses format)
+        if not isinstance(result, list):
+            logger.warning(f"parse_js_content: parsed result is not a list ({type(result).__name__}) — {file_path}")
+            return []
+
+        logger.debug(f"parse_js_content: OK — {file_path.name} ({len(result)} items)")
+        return result
 
     except json.JSONDecodeError as e:
         logger.error(f"parse_js_content: JSON decode error in {file_path.name} — {e}")
@@ -58,56 +139,47 @@ def parse_js_content(file_path: Path) -> list:
         return []
 
 
-def get_all_valid_images(text_content: str) -> set:
+def iter_valid_images(text_content: str) -> Iterator[str]:
     """
-    Extract valid image URLs from post content.
+    Yield valid image URLs from post content, in order of appearance.
     Excludes Plurk official stickers (mx_ prefix) and system images (emos/static domains).
-    Returns a set of URL strings.
+    A URL that appears more than once is yielded each time — callers that need
+    unique URLs de-duplicate themselves.
     """
     if not text_content:
-        return set()
-
-    # Normalize escaped slashes from JSON encoding
-    clean_text = text_content.replace('\\/', '/')
-    all_urls = GENERAL_IMAGE_PATTERN.findall(clean_text)
-
-    valid_urls = set()
-    for url in all_urls:
-        low_url = url.lower()
+        return
 
-        # Skip Plurk system image domains (UI chrome, not user content)
-        if "emos.plurk.com" in low_url or "static.plurk.com" in low_url:
-            continue
+    # Normalize escaped slashes from JSON encoding.
+    # Only when present — json.loads() has already unescaped most fields, so the
+    # cheap membership scan usually saves rebuilding the whole content string.
+    if '\\/' in text_content:
+        text_content = text_content.replace('\\/', '/')
 
-        # Skip Plurk user avatars — these are account profile pictures embedded
-        # as preview thumbnails in linked plurk HTML, not actual post content images.
-        # They consistently fail MIN_IMAGE_SIZE and are never worth downloading.
-        if "avatars.plurk.com" in low_url:
-            continue
+    for match in GENERAL_IMAGE_PATTERN.finditer(text_content):
+        url = match.group(0)
 
-        # Skip Plurk emoticons served from s.plurk.com/emoticons — tiny GIFs
-        # (basic, silver, gold, platinum tiers). Same rationale as emos.plurk.com —
-        # Plurk's emoticon CDN, not user-uploaded content.
-        if "s.plurk.com/emoticons" in low_url:
+        # Skip Plurk system images, avatars, emoticons, thumbnails and stickers
+        if SKIP_PATTERN.search(url):
             continue
 
-        # Skip Plurk auto-generated medium thumbnails (_mt suffix).
-        # Plurk generates _mt.jpg as a smaller version of every uploaded image.
-        # The full-size original (without _mt) is the version worth downloading
-        # and will be captured separately from the same post content.
-        if "imgs.plurk.com" in low_url and "_mt.jpg" in low_url:
-            continue
+        yield url
 
-        # Skip YouTube default thumbnails (120x90px, ~3-5KB) — always too small.
-        # Only filter the 'default.jpg' variant to preserve larger thumbnails
-        # (mqdefault, hqdefault, maxresdefault) in case they are ever linked directly.
-        if "i.ytimg.com" in low_url and "default.jpg" in low_url:
-            continue
 
-        # Skip official Plurk stickers (mx_ prefix)
-        if "images.plurk.com" in low_url and PLURK_EMOJI_PATTERN.search(url):
-            continue
+@lru_cache(maxsize=8192)
+def extract_valid_images(text_content: str) -> tuple[str, ...]:
+    """
+    Return the unique valid image URLs in post content, in first-seen order.
+    Cached per content string — reshared plurks and quoted responses repeat
+    the same content many times, and each distinct string is scanned once.
+    Returns a tuple so cached results cannot be modified by callers.
+    """
+    return tuple(dict.fromkeys(iter_valid_images(text_content)))
 
-        valid_urls.add(url)
 
-    return valid_urls
+def get_all_valid_images(text_content: str) -> set:
+    """
+    Extract valid image URLs from post content.
+    Excludes Plurk official stickers (mx_ prefix) and system images (emos/static domains).
+    Returns a set of URL strings.
+    """
+    return set(extract_valid_images(text_content))
@@ -2,20 +2,52 @@
 # Licensed under Apache License 2.0 (Non-Commercial Use Only)
 # Disclaimer: Use at your own risk. The author is not responsible for any damages.
 
-from datetime import datetime
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from datetime import date, datetime
 from pathlib import Path
 from dataclasses import dataclass
-from typing import Callable, Optional
+from typing import Callable, Iterator, Optional
 
-from core.parser import parse_js_content, get_all_valid_images
-from core.downloader import download_image, DownloadResult
-from core.logger import get_logger
+from core.parser import parse_js_content, extract_valid_images
+from core.downloader import download_image, url_file_name, DownloadResult, MAX_CONCURRENT_DOWNLOADS
+from core.logger import get_logger, init_worker_logging, start_worker_log_forwarding
 from core.i18n import t
 
 logger = get_logger()
 
+# ==========================================
+# JS parsing constants
+# ==========================================
 
-@dataclass
+# Minimum number of JS files in a folder before parsing moves to worker processes.
+# JSON decoding and URL extraction are CPU-bound, so worker processes sidestep
+# the GIL — but starting them costs more than parsing a handful of files inline.
+PARSE_PROCESS_MIN_FILES = 8
+
+# Number of JS files handed to a parse worker process per task.
+PARSE_CHUNK_SIZE = 4
+
+# on_log messages are handed over in batches of up to LOG_BATCH_SIZE lines,
+# or whatever has collected once LOG_FLUSH_INTERVAL seconds have passed.
+LOG_BATCH_SIZE = 32
+LOG_FLUSH_INTERVAL = 0.1
+
+# Layout of the "posted" field in Plurk backups (RFC 1123, always GMT),
+# e.g. "Fri, 01 Mar 2024 10:20:00 GMT".
+POSTED_DATE_FORMAT = "%a, %d %b %Y %H:%M:%S GMT"
+
+_MONTHS = {
+    "Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
+    "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12,
+}
+
+
+@dataclass(slots=True)
 class ProcessStats:
     """
     Aggregated statistics for a full processing run.
@@ -38,7 +70,7 @@ class ProcessStats:
         return self
 
 
-@dataclass
+@dataclass(slots=True)
 class PrescanStats:
     """
     Statistics from a pre-scan pass (read-only, no downloads).
@@ -49,6 +81,184 @@ class PrescanStats:
     existing_files_count: int = 0
 
 
+class _LogBuffer:
+    """
+    Collect on_log messages and pass them to the sink in batches, joined by newlines.
+    In the GUI every on_log call schedules its own Tk update; batching keeps a
+    burst of downloads from flooding the UI thread (or the console in CLI mode).
+    Used only from the thread running process_folder(), so it needs no lock.
+    Also a context manager that flushes whatever is left on exit.
+    """
+
+    def __init__(self, sink: Optional[Callable[[str], None]]) -> None:
+        self._sink = sink
+        self._batch: list[str] = []
+        self._last_flush = time.monotonic()
+
+    def push(self, msg: str) -> None:
+        """Queue msg, flushing once the batch is full or has waited long enough."""
+        if self._sink is None:
+            return
+        self._batch.append(msg)
+        if len(self._batch) >= LOG_BATCH_SIZE or time.monotonic() - self._last_flush >= LOG_FLUSH_INTERVAL:
+            self.flush()
+
+    def flush(self) -> None:
+        """Pass all queued messages to the sink as one newline-joined string."""
+        if self._batch:
+            batch, self._batch = self._batch, []
+            self._sink("\n".join(batch))
+        self._last_flush = time.monotonic()
+
+    def __enter__(self) -> "_LogBuffer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.flush()
+
+
+def _list_js_files(source_dir: Path) -> list[Path]:
+    """
+    Return the JS backup files directly inside source_dir.
+    A single os.scandir() pass with a plain suffix check — cheaper than
+    Path.glob() for folders holding thousands of backup files.
+    normcase() keeps the match case-insensitive on Windows, like glob().
+    """
+    with os.scandir(source_dir) as entries:
+        return [
+            Path(entry.path) for entry in entries
+            if os.path.normcase(entry.name).endswith(".js") and entry.is_file()
+        ]
+
+
+def _parse_posted_date(posted_date: str) -> datetime:
+    """
+    Parse a Plurk "posted" timestamp into a naive datetime.
+    The field has a fixed layout, so it is sliced by position instead of going
+    through datetime.strptime(), which re-reads the format string every call.
+    Anything that does not fit the layout falls back to strptime().
+    Raises ValueError if posted_date is not a valid timestamp.
+    """
+    if len(posted_date) == 29 and posted_date.endswith(" GMT"):
+        try:
+            return datetime(
+                int(posted_date[12:16]), _MONTHS[posted_date[8:11]], int(posted_date[5:7]),
+                int(posted_date[17:19]), int(posted_date[20:22]), int(posted_date[23:25]),
+            )
+        except (KeyError, ValueError):
+            pass
+    return datetime.strptime(posted_date, POSTED_DATE_FORMAT)
+
+
+def _parse_and_extract(js_file: Path) -> list[tuple[str, list[str]]] | None:
+    """
+    Parse one JS backup file and extract the image URLs of every item.
+    Module-level and returning plain strings only, so it can run in a parse
+    worker process and only (posted, urls) pairs — not whole items — are sent back.
+    Returns None if no items were parsed from the file.
+    """
+    items = parse_js_content(js_file)
+
+    if not items:
+        return None
+
+    entries = []
+    for item in items:
+        # content is the rendered HTML of content_raw and links every image URL
+        # written in it, so content_raw is only scanned when content has none.
+        # The two strings almost never match (HTML vs raw text), so an "is it
+        # different" check would scan content_raw for nearly every item.
+        urls = extract_valid_images(item.get("content", "") or "")
+        if not urls:
+            urls = extract_valid_images(item.get("content_raw", "") or "")
+        entries.append((item.get("posted", ""), list(urls)))
+    return entries
+
+
+def _pool_parse_results(
+    parse_pool: ProcessPoolExecutor,
+    js_files: list[Path],
+) -> Iterator[list[tuple[str, list[str]]] | None]:
+    """
+    Yield _parse_and_extract() results from parse_pool, in js_files order.
+    If the pool breaks — e.g. a worker process fails to start or dies — the
+    files not yet yielded are parsed inline instead, so one broken worker
+    never ends the backup run.
+    """
+    done = 0
+    try:
+        for result in parse_pool.map(_parse_and_extract, js_files, chunksize=PARSE_CHUNK_SIZE):
+            yield result
+            done += 1
+    except (BrokenProcessPool, OSError) as e:
+        logger.warning(
+            f"_parsed_js_files: parse worker pool failed — {type(e).__name__}: {e}; "
+            f"parsing the remaining {len(js_files) - done} files inline"
+        )
+        yield from map(_parse_and_extract, js_files[done:])
+
+
+@contextmanager
+def _parsed_js_files(js_files: list[Path]) -> Iterator[Iterator[list[tuple[str, list[str]]] | None]]:
+    """
+    Yield an iterator of _parse_and_extract() results, in js_files order.
+    With PARSE_PROCESS_MIN_FILES or more files, parsing runs ahead on a pool of
+    worker processes while the caller downloads; otherwise files are parsed
+    inline as the iterator is consumed. If the pool cannot be set up or breaks
+    mid-run, parsing falls back to inline (see _pool_parse_results()).
+    Workers are started with "spawn" on every platform — forking a process that
+    is already running download and logging threads is not safe.
+    """
+    if len(js_files) < PARSE_PROCESS_MIN_FILES:
+        yield map(_parse_and_extract, js_files)
+        return
+
+    context = multiprocessing.get_context("spawn")
+    try:
+        log_queue, listener = start_worker_log_forwarding(context)
+    except OSError as e:
+        logger.warning(f"_parsed_js_files: cannot start parse workers — {e}; parsing inline")
+        yield map(_parse_and_extract, js_files)
+        return
+
+    try:
+        with ProcessPoolExecutor(
+            max_workers=min(os.cpu_count() or 1, len(js_files)),
+            mp_context=context,
+            initializer=init_worker_logging,
+            initargs=(log_queue,),
+        ) as parse_pool:
+            yield _pool_parse_results(parse_pool, js_files)
+    finally:
+        listener.stop()
+
+
+class _DateFolderCache:
+    """
+    Resolve Plurk "posted" strings to (datetime, date folder) pairs.
+    Each distinct posted string is parsed once, and every posted time on the
+    same day shares one date folder Path instead of building its own.
+    Raises ValueError from resolve() for invalid dates (nothing is cached).
+    """
+
+    def __init__(self, output_root: Path) -> None:
+        self._output_root = output_root
+        self._by_posted: dict[str, tuple[datetime, Path]] = {}
+        self._by_day: dict[date, Path] = {}
+
+    def resolve(self, posted_date: str) -> tuple[datetime, Path]:
+        """Return (datetime, date folder) for posted_date."""
+        cached = self._by_posted.get(posted_date)
+        if cached is None:
+            dt = _parse_posted_date(posted_date)
+            day = dt.date()
+            date_folder = self._by_day.get(day)
+            if date_folder is None:
+                date_folder = self._by_day[day] = self._output_root / dt.strftime("%Y-%m-%d")
+            cached = self._by_posted[posted_date] = (dt, date_folder)
+        return cached
+
+
 def prescan_folder(
     source_dir: Path,
     output_root: Path,
@@ -72,40 +282,37 @@ def prescan_folder(
         logger.debug(f"prescan_folder [{label}]: source dir not found, skipping — {source_dir}")
         return stats
 
-    js_files = list(source_dir.glob("*.js"))
+    js_files = _list_js_files(source_dir)
     total_files = len(js_files)
 
     logger.debug(f"prescan_folder [{label}]: scanning {total_files} JS files")
 
-    for js_file in js_files:
-        items = parse_js_content(js_file)
-
-        if not items:
-            logger.debug(f"prescan_folder [{label}]: no items parsed from {js_file.name}")
-            continue
-
-        for item in items:
-            posted_date = item.get("posted", "")
-            try:
-                dt = datetime.strptime(posted_date, "%a, %d %b %Y %H:%M:%S GMT")
-                date_folder = output_root / dt.strftime("%Y-%m-%d")
-            except ValueError:
-                logger.debug(
-                    f"prescan_folder [{label}]: invalid date '{posted_date}' in {js_file.name}"
-                )
+    date_folders = _DateFolderCache(output_root)
+
+    # Same parse and URL extraction path as process_folder()
+    with _parsed_js_files(js_files) as parsed_files:
+        for js_file, entries in zip(js_files, parsed_files):
+            if not entries:
+                logger.debug(f"prescan_folder [{label}]: no items parsed from {js_file.name}")
                 continue
 
-            content = (item.get("content", "") or "") + " " + (item.get("content_raw", "") or "")
-            urls = get_all_valid_images(content)
+            for posted_date, urls in entries:
+                try:
+                    _, date_folder = date_folders.resolve(posted_date)
+                except ValueError:
+                    logger.debug(
+                        f"prescan_folder [{label}]: invalid date '{posted_date}' in {js_file.name}"
+                    )
+                    continue
 
-            for url in urls:
-                file_name = url.split('/')[-1].split('?')[0]
-                save_path = date_folder / file_name
+                for url in urls:
+                    file_name = url_file_name(url)
+                    save_path = date_folder / file_name
 
-                if save_path.exists():
-                    stats.existing_files_count += 1
-                else:
-                    stats.new_urls_count += 1
+                    if save_path.exists():
+                        stats.existing_files_count += 1
+                    else:
+                        stats.new_urls_count += 1
 
     logger.debug(
         f"prescan_folder [{label}]: done — "
@@ -115,6 +322,49 @@ def prescan_folder(
     return stats
 
 
+def _download_group(
+    date_folder: Path,
+    jobs: list[tuple[str, datetime]],
+    do_exif: bool,
+) -> list[tuple[str, DownloadResult]]:
+    """
+    Download a group of URLs that resolve to the same save path, in order.
+    Runs on a pool worker thread. Keeping same-path URLs in one group means
+    no two workers ever write the same file, and later duplicates see the
+    first one's file as already existing — same as the sequential loop did.
+    """
+    return [(url, download_image(url, date_folder, dt, do_exif)) for url, dt in jobs]
+
+
+def _run_download_groups(
+    pool: ThreadPoolExecutor,
+    groups: dict[tuple[Path, str], tuple[str, list[tuple[str, datetime]]]],
+    do_exif: bool,
+) -> Iterator[tuple[str, str, DownloadResult]]:
+    """
+    Dispatch download groups to the pool and yield (url, file_name, result)
+    as they finish. groups maps (date_folder, normcased file name) to
+    (display file name, jobs); file_name is that display name, so callers
+    never have to re-derive it from the URL.
+    At most MAX_CONCURRENT_DOWNLOADS groups are submitted at a time, so closing
+    the app mid-run only waits for the downloads already in flight.
+    """
+    pending = {}
+
+    for (date_folder, _), (file_name, jobs) in groups.items():
+        if len(pending) >= MAX_CONCURRENT_DOWNLOADS:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                done_name = pending.pop(future)
+                for url, result in future.result():
+                    yield url, done_name, result
+        pending[pool.submit(_download_group, date_folder, jobs, do_exif)] = file_name
+
+    for future in as_completed(pending):
+        for url, result in future.result():
+            yield url, pending[future], result
+
+
 def process_folder(
     source_dir: Path,
     output_root: Path,
@@ -126,6 +376,10 @@ def process_folder(
     """
     Scan all JS backup files in source_dir and download images to output_root.
     Organizes downloaded images into subfolders by date (YYYY-MM-DD).
+    Images from each JS file are downloaded concurrently on a pool of
+    MAX_CONCURRENT_DOWNLOADS worker threads, while larger folders have their
+    JS files parsed ahead on worker processes (see _parsed_js_files());
+    callbacks are still invoked from the calling thread only.
 
     Parameters:
         source_dir:   Path to folder containing Plurk JS backup files.
@@ -133,73 +387,117 @@ def process_folder(
         label:        Display label for logging (e.g. '主噗' / '回應').
         do_exif:      Whether to write EXIF timestamps to JPEG files.
         on_log:       Optional callback(message: str) for UI-friendly output.
+                      Messages arrive in batches — one call may carry several
+                      newline-separated lines.
         on_progress:  Optional callback(current: int, total: int) for progress bar.
 
     Returns a ProcessStats dataclass.
     """
     stats = ProcessStats()
 
-    def ui_log(msg: str):
-        """Send friendly message to UI callback if available."""
-        if on_log:
-            on_log(msg)
+    # Friendly UI messages go through a batching buffer — see _LogBuffer
+    log_buffer = _LogBuffer(on_log)
+    ui_log = log_buffer.push
 
     if not source_dir.exists():
         ui_log(t("proc_warn_no_source", label=label))
+        log_buffer.flush()
         logger.warning(f"process_folder: source dir not found, skipping — {source_dir}")
         return stats
 
-    js_files = list(source_dir.glob("*.js"))
+    js_files = _list_js_files(source_dir)
     total_files = len(js_files)
 
     logger.info(f"process_folder [{label}]: start — {total_files} JS files in {source_dir}")
 
-    for file_index, js_file in enumerate(js_files):
-        items = parse_js_content(js_file)
-
-        if not items:
-            logger.debug(f"process_folder [{label}]: no items parsed from {js_file.name}, skipping")
-            continue
-
-        ui_log(t("proc_processing_file", label=label, filename=js_file.name))
-        logger.debug(f"process_folder [{label}]: processing {js_file.name} ({len(items)} items)")
-
-        for item in items:
-            posted_date = item.get("posted", "")
-            try:
-                dt = datetime.strptime(posted_date, "%a, %d %b %Y %H:%M:%S GMT")
-                date_folder = output_root / dt.strftime("%Y-%m-%d")
-            except ValueError:
-                logger.warning(
-                    f"process_folder [{label}]: invalid date '{posted_date}' "
-                    f"in {js_file.name} — item skipped"
-                )
-                continue
+    # Date folders already created this run — mkdir once per date, not per image.
+    # Folders that could not be created are remembered too, so the error is
+    # logged once and every later URL for that date simply counts as failed.
+    created_folders: set[Path] = set()
+    broken_folders: set[Path] = set()
 
-            content = (item.get("content", "") or "") + " " + (item.get("content_raw", "") or "")
-            urls = get_all_valid_images(content)
+    date_folders = _DateFolderCache(output_root)
 
-            for url in urls:
-                result: DownloadResult = download_image(url, date_folder, dt, do_exif)
+    # Plain local counters in the result loop; written back to stats at the end
+    downloaded = skipped = failed = exif_updated = 0
 
+    with log_buffer, _parsed_js_files(js_files) as parsed_files, ThreadPoolExecutor(
+        max_workers=MAX_CONCURRENT_DOWNLOADS, thread_name_prefix="download"
+    ) as pool:
+        for file_index, (js_file, entries) in enumerate(zip(js_files, parsed_files)):
+            if not entries:
+                logger.debug(f"process_folder [{label}]: no items parsed from {js_file.name}, skipping")
+                continue
+
+            ui_log(t("proc_processing_file", label=label, filename=js_file.name))
+            logger.debug(f"process_folder [{label}]: processing {js_file.name} ({len(entries)} items)")
+
+            # Group URLs by save path so same-named files are handled by one worker.
+            # The key is normcased: on Windows "A.jpg" and "a.jpg" are the same file,
+            # so they must share a group or two workers could write it at once.
+            groups: dict[tuple[Path, str], tuple[str, list[tuple[str, datetime]]]] = {}
+
+            for posted_date, urls in entries:
+                try:
+                    dt, date_folder = date_folders.resolve(posted_date)
+                except ValueError:
+                    logger.warning(
+                        f"process_folder [{label}]: invalid date '{posted_date}' "
+                        f"in {js_file.name} — item skipped"
+                    )
+                    continue
+
+                if urls and date_folder not in created_folders:
+                    if date_folder not in broken_folders:
+                        try:
+                            date_folder.mkdir(exist_ok=True, parents=True)
+                            created_folders.add(date_folder)
+                        except OSError as e:
+                            logger.error(
+                                f"process_folder [{label}]: cannot create folder {date_folder} — "
+                                f"{type(e).__name__}: {e}"
+                            )
+                            broken_folders.add(date_folder)
+
+                    if date_folder in broken_folders:
+                        failed += len(urls)
+                        for url in urls:
+                            ui_log(t("proc_failed", url=url))
+                        continue
+
+                for url in urls:
+                    file_name = url_file_name(url)
+                    key = (date_folder, os.path.normcase(file_name))
+                    groups.setdefault(key, (file_name, []))[1].append((url, dt))
+
+            for url, file_name, result in _run_download_groups(pool, groups, do_exif):
                 if result.downloaded:
-                    stats.downloaded += 1
-                    ui_log(t("proc_downloaded", filename=url.split('/')[-1].split('?')[0]))
+                    downloaded += 1
+                    ui_log(t("proc_downloaded", filename=file_name))
 
                 elif result.skipped:
-                    stats.skipped += 1
+                    skipped += 1
                     # Skip is normal and high-volume — DEBUG only, not shown in UI
 
                 elif result.failed:
-                    stats.failed += 1
+                    failed += 1
                     ui_log(t("proc_failed", url=url))
 
                 if result.exif_updated:
-                    stats.exif_updated += 1
-                    ui_log(t("proc_exif_updated", filename=url.split('/')[-1].split('?')[0]))
+                    exif_updated += 1
+                    ui_log(t("proc_exif_updated", filename=file_name))
+
+            # File boundary — show this file's messages before its progress step
+            log_buffer.flush()
+
+            if on_progress:
+                on_progress(file_index + 1, total_files)
+
+    stats = ProcessStats(
+        downloaded=downloaded, skipped=skipped, exif_updated=exif_updated, failed=failed
+    )
 
-        if on_progress:
-            on_progress(file_index + 1, total_files)
+    logger.debug(f"process_folder [{label}]: URL extraction cache — {extract_valid_images.cache_info()}")
 
     logger.info(
         f"process_folder [{label}]: done — "
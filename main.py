@@ -2,6 +2,7 @@
 # Licensed under Apache License 2.0 (Non-Commercial Use Only)
 # Disclaimer: Use at your own risk. The author is not responsible for any damages.
 
+import multiprocessing
 import sys
 import io
 import os
@@ -175,4 +176,7 @@ def main():
 
 
 if __name__ == "__main__":
+    # Required for the JS parsing worker processes in a PyInstaller build —
+    # a no-op when running from source
+    multiprocessing.freeze_support()
     main()
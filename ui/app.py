@@ -3,19 +3,25 @@
 # Disclaimer: Use at your own risk. The author is not responsible for any damages.
 # --------------------
 import customtkinter as ctk
+import tkinter as tk
+import multiprocessing
 import subprocess
 import os
+import queue
 import sys
 import threading
 import traceback
+from concurrent.futures import Future
+from functools import lru_cache
 from pathlib import Path
 from tkinter import filedialog
 
 # Ensure project root is in sys.path so 'core' package can be found
 # regardless of which directory the script is launched from
-PROJECT_ROOT = Path(__file__).resolve().parent.parent
-if str(PROJECT_ROOT) not in sys.path:
-    sys.path.insert(0, str(PROJECT_ROOT))
+# (abspath, not Path.resolve(): no symlink walk is needed just to find the parent)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
 
 from core.i18n import load_config, load_language, save_config, get_language, t, SUPPORTED_LANGUAGES
 from core.logger import setup_logger, get_logger, shutdown_logger, _get_existing_log_path
@@ -55,6 +61,56 @@ CLR_BTN_PRIMARY = "#64748b"   # primary action button background
 CLR_BTN_HOVER = "#333333"   # primary action button hover
 
 
+# ==========================================
+# Backup folder layout
+# ==========================================
+# Shared "data" prefix of the plurks/ and responses/ input folders
+DATA_SUB = Path("data")
+
+
+# ==========================================
+# Fonts
+# ==========================================
+@lru_cache(maxsize=None)
+def _font(family: str | None = None, size: int | None = None, weight: str | None = None) -> ctk.CTkFont:
+    """
+    Return the shared CTkFont for this family / size / weight, creating it on first use.
+    Fonts cannot be created at import time (Tk needs a root window first), so
+    each one is built once the App exists and then reused by every widget.
+    """
+    return ctk.CTkFont(family=family, size=size, weight=weight)
+
+
+# ==========================================
+# UI update timing
+# ==========================================
+# Worker threads never touch Tk directly: they put tagged messages on a queue
+# that the main thread drains every UI_DRAIN_MS milliseconds (~60 FPS). All log
+# lines and the latest progress value from one drain are drawn together.
+UI_DRAIN_MS = 16
+
+# At most UI_DRAIN_MAX_ITEMS messages are handled per drain, so a flood of log
+# messages is spread over several drains instead of stalling the UI in one.
+UI_DRAIN_MAX_ITEMS = 256
+
+# Maximum number of lines kept in the log box. Older lines are trimmed from
+# the top — the full record is always in the session log file. Trimming waits
+# until the box is LOG_TRIM_SLACK lines over the limit, then removes them in
+# one delete, instead of deleting a few lines on every write.
+MAX_LOG_LINES = 2000
+LOG_TRIM_SLACK = 500
+
+# Progress changes smaller than PROGRESS_MIN_STEP are not queued at all.
+PROGRESS_MIN_STEP = 0.005
+
+# Keys still accepted by the read-only log box (see App._block_log_edit()),
+# and the event.state bits of its copy / select-all shortcuts: Control everywhere,
+# plus Mod1 (Command) on macOS only — on Windows Tk, 0x0008 is NumLock being on.
+_LOG_NAV_KEYS = frozenset({"Left", "Right", "Up", "Down", "Home", "End", "Prior", "Next"})
+_CONTROL_MASK = 0x0004
+_COMMAND_MASK = 0x0008
+
+
 class FolderRow(ctk.CTkFrame):
     """
     Reusable row widget: label + path entry + browse button.
@@ -71,17 +127,21 @@ class FolderRow(ctk.CTkFrame):
         ctk.CTkLabel(
             self, text=label,
             text_color=CLR_SUBTEXT,
-            font=ctk.CTkFont(family="monospace", size=12),
+            font=_font(family="monospace", size=12),
             width=140, anchor="w"
         ).grid(row=0, column=0, padx=(0, 8), sticky="w")
 
         # Path entry (editable)
+        # _path mirrors the entry text as a Path, refreshed on every write
+        # (browse or typing) so reading .path never rebuilds it.
         self._var = ctk.StringVar(value=default_path)
+        self._path = Path(default_path)
+        self._var.trace_add("write", self._on_var_write)
         self._entry = ctk.CTkEntry(
             self,
             textvariable=self._var,
             placeholder_text=t("folder_placeholder"),
-            font=ctk.CTkFont(size=14),
+            font=_font(size=14),
             fg_color=CLR_BG,
             border_color=CLR_ENTRY_BORDER,
             text_color=CLR_TEXT,
@@ -98,47 +158,35 @@ class FolderRow(ctk.CTkFrame):
             border_color=CLR_ENTRY_BORDER,
             border_width=1,
             text_color=CLR_TEXT,
-            font=ctk.CTkFont(size=14),
+            font=_font(size=14),
             command=self._browse,
         ).grid(row=0, column=2, sticky="e")
 
     def _browse(self):
-        """Open folder picker dialog and update entry."""
+        """
+        Open folder picker dialog and update entry.
+        The dialog stays on the main thread: Tk is not thread-safe, and macOS
+        refuses to show native dialogs from any other thread. It is not a UI
+        freeze — the dialog runs its own event loop, so pending after()
+        callbacks (the UI message queue drain) keep running while it is open.
+        """
         chosen = filedialog.askdirectory(title=t("folder_label_data"))
         if chosen:
-            self._var.set(chosen)
-            if self._on_change:
-                self._on_change(chosen)
-
-    @property
-    def path(self) -> Path:
-        return Path(self._var.get())
-
+            self._apply_choice(chosen)
 
-class StatCard(ctk.CTkFrame):
-    """
-    Stat display card with subtle background and rounded corners.
-    """
-
-    def __init__(self, master, label: str, color: str, **kwargs):
-        super().__init__(master, fg_color=CLR_PANEL, corner_radius=10, **kwargs)
+    def _apply_choice(self, chosen: str):
+        """Store the chosen folder and notify the owner (main thread)."""
+        self._var.set(chosen)
+        if self._on_change:
+            self._on_change(chosen)
 
-        self._var = ctk.StringVar(value="0")
-
-        ctk.CTkLabel(
-            self, textvariable=self._var,
-            font=ctk.CTkFont(size=28, weight="bold"),
-            text_color=color,
-        ).pack(pady=(12, 0))
+    def _on_var_write(self, *_args):
+        """Keep the cached Path in step with the entry text."""
+        self._path = Path(self._var.get())
 
-        ctk.CTkLabel(
-            self, text=label,
-            font=ctk.CTkFont(size=11),
-            text_color=CLR_SUBTEXT,
-        ).pack(pady=(0, 12))
-
-    def set(self, value: int):
-        self._var.set(str(value))
+    @property
+    def path(self) -> Path:
+        return self._path
 
 
 class App(ctk.CTk):
@@ -151,10 +199,25 @@ class App(ctk.CTk):
         self.configure(fg_color=CLR_BG)
 
         # Track whether a backup run is currently in progress.
-        # Set True when worker thread starts, False when _on_done() is called.
+        # Set True when worker thread starts, False when the run settles (see _settle()).
         # Used by on_closing() to decide whether to show the confirmation dialog.
         self._running: bool = False
 
+        # Messages for the main thread, drained by _drain_ui(). Each item is a
+        # tuple tagged by its first element: ("log", lines, tag), ("progress", value),
+        # ("header", text) or ("settled", future) when a backup run has ended.
+        # A log tag is one of the log box colour tags.
+        self._ui_q: queue.SimpleQueue = queue.SimpleQueue()
+
+        # Run counts shown in the stat row, in column order: downloaded,
+        # skipped, EXIF updated, failed. Written to the row by _publish_stats().
+        self._stats: list[int] = [0, 0, 0, 0]
+        # The matching number labels, filled in by _ensure_stats_row()
+        self._stat_labels: list[ctk.CTkLabel] = []
+
+        # Last progress value queued for drawing (see _on_progress())
+        self._last_progress_value: float = 0.0
+
         # Logger already initialized in main() before App is constructed
         self._logger   = get_logger()
         self._log_path = _get_existing_log_path(self._logger)
@@ -164,10 +227,20 @@ class App(ctk.CTk):
         # Register exception hooks before building UI so any init error is captured
         self._register_exception_hooks()
 
-        self._build_ui()
+        # Build the window chrome hidden, resolve its geometry in one idle pass,
+        # then show it. The heavier panels are built by an idle callback, so the
+        # first paint does not wait for them.
+        # wm_withdraw() rather than withdraw(): CTk's withdraw() override would
+        # mark the window as hidden on purpose and never show it on Windows.
+        self.wm_withdraw()
+        self._build_chrome()
+        self.update_idletasks()
+        self.wm_deiconify()
+        self.after_idle(self._build_rest_of_ui)
 
         # Show log retention message at the top of the log window if old
         # session files were deleted during setup_logger() at this launch.
+        # Queued now, written once the log box exists.
         if cleanup_msg:
             self._append_log(cleanup_msg)
 
@@ -177,13 +250,12 @@ class App(ctk.CTk):
         self._logger.info(f"UI ready — log file: {self._log_path}")
 
     # ------------------------------------------------------------------
-    # Exception hooks — catch unhandled errors in all threads
+    # Exception hooks — catch unhandled errors in main and worker threads
     # ------------------------------------------------------------------
 
     def _register_exception_hooks(self):
         """
-        Register global exception handlers for both the main thread and
-        any background worker threads.
+        Register global exception handlers for both the main thread and worker threads.
 
         sys.excepthook:
             Called when an unhandled exception reaches the top of the main thread.
@@ -191,11 +263,15 @@ class App(ctk.CTk):
             Without this, the traceback prints to stderr but is never saved to the log.
 
         threading.excepthook:
-            Called when an unhandled exception occurs inside any Thread.
-            In Python < 3.8, thread exceptions were silently swallowed entirely.
-            In Python >= 3.8, they print to stderr but still bypass sys.excepthook.
-            We capture them here, log the full traceback, and reset the UI state
-            so the Start button doesn't stay stuck in "執行中..." forever.
+            Called when an unhandled exception occurs inside any other Thread
+            (e.g. download pool or logger threads). In Python >= 3.8 these print
+            to stderr but bypass sys.excepthook. We only log the full traceback
+            here — the UI is not touched.
+
+        The backup worker thread never reaches threading.excepthook: everything
+        it raises is caught into the run's Future and handled by _settle()
+        (see _start()), which logs the traceback and resets the UI so the
+        Start button doesn't stay stuck in "執行中..." forever.
         """
         def _main_excepthook(exc_type, exc_value, exc_tb):
             tb_text = "".join(traceback.format_exception(exc_type, exc_value, exc_tb))
@@ -211,21 +287,19 @@ class App(ctk.CTk):
             self._logger.critical(
                 f"Unhandled exception in thread '{thread_name}':\n{tb_text}"
             )
-            # Reset UI on the main thread — worker died without calling _on_done()
-            self.after(0, self._on_worker_crash)
 
         sys.excepthook = _main_excepthook
         threading.excepthook = _thread_excepthook
 
     def _on_worker_crash(self):
         """
-        Called on the main thread when the worker thread died unexpectedly.
+        Called on the main thread (via _settle()) when the worker thread died unexpectedly.
         Resets UI to a recoverable state so the user can try again.
         """
         self._running = False
         self._start_btn.configure(state="normal", text=t("btn_start_backup"))
         self._append_log("")
-        self._append_log(t("log_worker_crash"))
+        self._append_log(t("log_worker_crash"), "err")
         self._logger.error("Worker thread crashed — UI reset to idle state")
 
     # ------------------------------------------------------------------
@@ -244,8 +318,9 @@ class App(ctk.CTk):
             and close. If user cancels, do nothing and let the backup continue.
 
         Note: closing while a backup is running will kill the daemon worker thread
-        immediately. Any image currently mid-download will be lost. Completed
-        downloads are already saved to disk and are not affected.
+        immediately, so no further downloads are started. The few downloads already
+        in flight on the download pool are allowed to finish before the process
+        exits. Completed downloads are already saved to disk and are not affected.
         """
         if not self._running:
             self._logger.info("User closed the window — no active run")
@@ -273,14 +348,14 @@ class App(ctk.CTk):
         ctk.CTkLabel(
             dialog,
             text=t("dialog_msg_backup_running"),
-            font=ctk.CTkFont(size=14, weight="bold"),
+            font=_font(size=14, weight="bold"),
             text_color=CLR_TEXT,
         ).pack(pady=(28, 4))
 
         ctk.CTkLabel(
             dialog,
             text=t("dialog_msg_download_interrupted"),
-            font=ctk.CTkFont(size=12),
+            font=_font(size=12),
             text_color=CLR_SUBTEXT,
         ).pack(pady=(0, 20))
 
@@ -306,7 +381,7 @@ class App(ctk.CTk):
             fg_color=CLR_ERROR,
             hover_color="#b91c1c",
             text_color="#ffffff",
-            font=ctk.CTkFont(size=13),
+            font=_font(size=13),
             command=_confirm,
         ).pack(side="left", padx=(0, 12))
 
@@ -317,7 +392,7 @@ class App(ctk.CTk):
             fg_color=CLR_BTN_PRIMARY,
             hover_color=CLR_BTN_HOVER,
             text_color="#ffffff",
-            font=ctk.CTkFont(size=13),
+            font=_font(size=13),
             command=_cancel,
         ).pack(side="left")
 
@@ -362,7 +437,11 @@ class App(ctk.CTk):
     # UI Construction
     # ------------------------------------------------------------------
 
-    def _build_ui(self):
+    def _build_chrome(self):
+        """
+        Build the window chrome — header and Start button — before the first paint.
+        The Start button stays disabled until _build_rest_of_ui() has run.
+        """
         self.columnconfigure(0, weight=1)
         self.rowconfigure(2, weight=1)  # log area expands
 
@@ -374,7 +453,7 @@ class App(ctk.CTk):
         ctk.CTkLabel(
             header,
             text=f"  {t('header_title')}",
-            font=ctk.CTkFont(size=20, weight="bold"),
+            font=_font(size=20, weight="bold"),
             text_color=CLR_TEXT,
         ).grid(row=0, column=0, pady=16, padx=24, sticky="w")
 
@@ -382,7 +461,7 @@ class App(ctk.CTk):
         ctk.CTkLabel(
             header,
             text="Plurk Image Backup Organizer",
-            font=ctk.CTkFont(family="monospace", size=14),
+            font=_font(family="monospace", size=14),
             text_color=CLR_SUBTEXT,
         ).grid(row=0, column=1, pady=16, padx=8, sticky="w")
 
@@ -398,13 +477,37 @@ class App(ctk.CTk):
             button_color=CLR_BTN_PRIMARY,
             button_hover_color=CLR_BTN_HOVER,
             text_color=CLR_TEXT,
-            font=ctk.CTkFont(size=12),
+            font=_font(size=12),
             width=110,
             height=30,
         )
         self._lang_dropdown.set(current_label)
         self._lang_dropdown.grid(row=0, column=2, pady=16, padx=24, sticky="e")
 
+        # ── Stat Row — built on first Start, see _ensure_stats_row() ──
+        self._stats_wrapper = None
+
+        # ── Start Button ─────────────────────────────────────────
+        self._start_btn = ctk.CTkButton(
+            self,
+            text=t("btn_start_backup"),
+            height=44,
+            font=_font(size=14, weight="bold"),
+            fg_color=CLR_BTN_PRIMARY,
+            hover_color=CLR_BTN_HOVER,
+            text_color="#ffffff",
+            corner_radius=10,
+            command=self._start,
+            state="disabled",
+        )
+        self._start_btn.grid(row=5, column=0, sticky="ew", padx=20, pady=16)
+
+    def _build_rest_of_ui(self):
+        """
+        Build the settings panel, log area and progress bar (idle callback
+        scheduled in __init__), then enable the Start button and begin
+        draining the UI message queue into the new log box.
+        """
         # ── Settings Panel ───────────────────────────────────────
         panel = ctk.CTkFrame(self, fg_color=CLR_PANEL, corner_radius=12)
         panel.grid(row=1, column=0, sticky="ew", padx=20, pady=(16, 0))
@@ -412,7 +515,7 @@ class App(ctk.CTk):
 
         ctk.CTkLabel(
             panel, text=t("settings_title"),
-            font=ctk.CTkFont(size=14, weight="bold"),
+            font=_font(size=14, weight="bold"),
             text_color=CLR_ACCENT,
         ).grid(row=0, column=0, sticky="w", padx=16, pady=(14, 6))
 
@@ -425,7 +528,7 @@ class App(ctk.CTk):
         ctk.CTkLabel(
             panel,
             text=t("settings_hint"),
-            font=ctk.CTkFont(family="monospace", size=14),
+            font=_font(family="monospace", size=14),
             text_color=CLR_SUBTEXT,
             anchor="w",
         ).grid(row=2, column=0, sticky="w", padx=16, pady=(0, 4))
@@ -436,7 +539,7 @@ class App(ctk.CTk):
             panel,
             textvariable=self._output_path_var,
             state="readonly",
-            font=ctk.CTkFont(family="monospace", size=14),
+            font=_font(family="monospace", size=14),
             fg_color=CLR_BG,
             border_color=CLR_BG,
             text_color=CLR_TEXT,
@@ -452,7 +555,7 @@ class App(ctk.CTk):
             exif_row,
             text=t("exif_switch_label"),
             variable=self._exif_var,
-            font=ctk.CTkFont(size=12),
+            font=_font(size=12),
             text_color=CLR_TEXT,
             progress_color=CLR_ACCENT2,
         )
@@ -464,7 +567,7 @@ class App(ctk.CTk):
             ctk.CTkLabel(
                 exif_row,
                 text=f"  {t('exif_not_installed')}",
-                font=ctk.CTkFont(size=11),
+                font=_font(size=11),
                 text_color=CLR_WARN,
             ).pack(side="left")
             self._logger.warning("piexif not available — EXIF switch disabled")
@@ -477,22 +580,52 @@ class App(ctk.CTk):
 
         self._header_label = ctk.CTkLabel(
             log_frame, text=t("log_title"),
-            font=ctk.CTkFont(size=13, weight="bold"),
+            font=_font(size=13, weight="bold"),
             text_color=CLR_ACCENT,
         )
         self._header_label.grid(row=0, column=0, sticky="w", padx=16, pady=(12, 4))
 
-        self._log_box = ctk.CTkTextbox(
+        # A plain tk.Text rather than CTkTextbox: the log only needs append and
+        # scroll, and this skips CTkTextbox's wrapper and the scrollbar-visibility
+        # check it re-runs on a timer. Plain Tk gets no CTk widget scaling, so
+        # the font's pixel size is scaled here, once.
+        log_font_px = round(11 * ctk.ScalingTracker.get_widget_scaling(log_frame))
+        self._log_box = tk.Text(
             log_frame,
-            font=ctk.CTkFont(family="monospace", size=11),
-            fg_color=CLR_BG,
-            text_color=CLR_TEXT,
-            border_color=CLR_ENTRY_BORDER,
-            border_width=1,
+            font=("monospace", -log_font_px),
+            bg=CLR_BG,
+            fg=CLR_TEXT,
+            selectbackground=CLR_BTN_PRIMARY,
+            bd=0,
+            padx=6,
+            pady=4,
+            highlightthickness=1,
+            highlightbackground=CLR_ENTRY_BORDER,
+            highlightcolor=CLR_ENTRY_BORDER,
             wrap="word",
-            state="disabled",
+            insertwidth=0,  # no blinking cursor — the box is read-only to the user
         )
-        self._log_box.grid(row=1, column=0, sticky="nsew", padx=12, pady=(0, 12))
+        self._log_box.grid(row=1, column=0, sticky="nsew", padx=(12, 0), pady=(0, 12))
+
+        log_scrollbar = ctk.CTkScrollbar(log_frame, command=self._log_box.yview)
+        log_scrollbar.grid(row=1, column=1, sticky="ns", padx=(0, 6), pady=(0, 12))
+        self._log_box.configure(yscrollcommand=log_scrollbar.set)
+
+        # Colour tags for log lines — the text keeps its ASCII status marker
+        # ([OK], [!!], ...), the tag only colours it
+        self._log_box.tag_config("info", foreground=CLR_TEXT)
+        self._log_box.tag_config("ok", foreground=CLR_SUCCESS)
+        self._log_box.tag_config("warn", foreground=CLR_WARN)
+        self._log_box.tag_config("err", foreground=CLR_ERROR)
+
+        # The log box stays in state="normal" so writes need no configure()
+        # toggling; user edits are blocked by these bindings instead.
+        self._copy_modifiers = _CONTROL_MASK
+        if self.tk.call("tk", "windowingsystem") == "aqua":
+            self._copy_modifiers |= _COMMAND_MASK
+        self._log_box.bind("<Key>", self._block_log_edit)
+        for sequence in ("<<Paste>>", "<<PasteSelection>>", "<<Cut>>", "<<Clear>>"):
+            self._log_box.bind(sequence, lambda event: "break")
 
         # ── Progress Bar ─────────────────────────────────────────
         self._progress = ctk.CTkProgressBar(
@@ -505,57 +638,72 @@ class App(ctk.CTk):
         self._progress.grid(row=3, column=0, sticky="ew", padx=20, pady=(8, 0))
         self._progress.set(0)
 
-        # ── Stat Cards with nav-style top/bottom border ──────────
-        stats_wrapper = ctk.CTkFrame(self, fg_color="transparent", corner_radius=0)
-        stats_wrapper.grid(row=4, column=0, sticky="ew", padx=20, pady=(10, 0))
-        stats_wrapper.columnconfigure(0, weight=1)
+        self._start_btn.configure(state="normal")
+        self.after(UI_DRAIN_MS, self._drain_ui)
+
+    def _ensure_stats_row(self):
+        """
+        Build the stat row (with its nav-style top/bottom border) the first
+        time a run starts. It only shows results, so creating it lazily keeps
+        it off the startup path.
+
+        The four stats share one panel frame: each column is a number label
+        over a caption label, with no per-stat frame.
+        """
+        if self._stats_wrapper is not None:
+            return
+
+        self._stats_wrapper = ctk.CTkFrame(self, fg_color="transparent", corner_radius=0)
+        self._stats_wrapper.grid(row=4, column=0, sticky="ew", padx=20, pady=(10, 0))
+        self._stats_wrapper.columnconfigure(0, weight=1)
 
         ctk.CTkFrame(
-            stats_wrapper, fg_color=CLR_DIVIDER,
+            self._stats_wrapper, fg_color=CLR_DIVIDER,
             height=1, corner_radius=0
         ).grid(row=0, column=0, sticky="ew")
 
-        stats_row = ctk.CTkFrame(stats_wrapper, fg_color="transparent", corner_radius=0)
-        stats_row.grid(row=1, column=0, sticky="ew")
+        stats_row = ctk.CTkFrame(self._stats_wrapper, fg_color=CLR_PANEL, corner_radius=10)
+        stats_row.grid(row=1, column=0, sticky="ew", pady=6)
         for i in range(4):
             stats_row.columnconfigure(i, weight=1)
 
-        self._card_dl   = StatCard(stats_row, t("stat_downloaded"), CLR_SUCCESS)
-        self._card_skip = StatCard(stats_row, t("stat_skipped"),    CLR_SUBTEXT)
-        self._card_exif = StatCard(stats_row, t("stat_exif"),       CLR_ACCENT2)
-        self._card_fail = StatCard(stats_row, t("stat_failed"),     CLR_ERROR)
-        self._card_dl.grid(row=0, column=0, sticky="ew", padx=(0, 6))
-        self._card_skip.grid(row=0, column=1, sticky="ew", padx=3)
-        self._card_exif.grid(row=0, column=2, sticky="ew", padx=3)
-        self._card_fail.grid(row=0, column=3, sticky="ew", padx=(6, 0))
+        # Same order as self._stats / self._stat_labels
+        stats = (
+            (t("stat_downloaded"), CLR_SUCCESS),
+            (t("stat_skipped"),    CLR_SUBTEXT),
+            (t("stat_exif"),       CLR_ACCENT2),
+            (t("stat_failed"),     CLR_ERROR),
+        )
+        for col, (label, color) in enumerate(stats):
+            value_label = ctk.CTkLabel(
+                stats_row, text="0",
+                font=_font(size=28, weight="bold"),
+                text_color=color,
+            )
+            value_label.grid(row=0, column=col, pady=(12, 0))
+            self._stat_labels.append(value_label)
+
+            ctk.CTkLabel(
+                stats_row, text=label,
+                font=_font(size=11),
+                text_color=CLR_SUBTEXT,
+            ).grid(row=1, column=col, pady=(0, 12))
 
         ctk.CTkFrame(
-            stats_wrapper, fg_color=CLR_DIVIDER,
+            self._stats_wrapper, fg_color=CLR_DIVIDER,
             height=1, corner_radius=0
         ).grid(row=2, column=0, sticky="ew")
 
-        # ── Start Button ─────────────────────────────────────────
-        self._start_btn = ctk.CTkButton(
-            self,
-            text=t("btn_start_backup"),
-            height=44,
-            font=ctk.CTkFont(size=14, weight="bold"),
-            fg_color=CLR_BTN_PRIMARY,
-            hover_color=CLR_BTN_HOVER,
-            text_color="#ffffff",
-            corner_radius=10,
-            command=self._start,
-        )
-        self._start_btn.grid(row=5, column=0, sticky="ew", padx=20, pady=16)
-
     # ------------------------------------------------------------------
     # Input dir change callback
     # ------------------------------------------------------------------
 
     def _on_data_dir_change(self, chosen: str):
         """Update output path display and log the user's folder selection."""
-        output = Path(chosen) / "plurk_images_by_date"
-        self._output_path_var.set(t("output_path_prefix") + str(output))
+        # Plain string path, only displayed and logged. normpath() keeps the
+        # native separators Path used to give (askdirectory() returns "/" on Windows)
+        output = os.path.normpath(os.path.join(chosen, "plurk_images_by_date"))
+        self._output_path_var.set(t("output_path_prefix") + output)
         self._logger.info(f"User selected input folder: {chosen}")
         self._logger.info(f"Resolved output folder: {output}")
 
@@ -569,62 +717,204 @@ class App(ctk.CTk):
         If info_text is empty, show only the log title.
         Otherwise append the info text to the log title.
         """
-        def _update():
-            if info_text:
-                self._header_label.configure(text=f"{t('log_title')}                {info_text}")
-            else:
-                self._header_label.configure(text=t("log_title"))
-        self.after(0, _update)
+        self._ui_q.put(("header", info_text))
 
-    def _append_log(self, msg: str):
+    def _apply_header_info(self, info_text: str):
+        """Write the header label text (main thread, see _set_header_info())."""
+        if info_text:
+            self._header_label.configure(text=f"{t('log_title')}                {info_text}")
+        else:
+            self._header_label.configure(text=t("log_title"))
+
+    def _append_log(self, msg: str, tag: str = "info"):
         """
         Append a friendly message to the UI log textbox (thread-safe).
         This is the on_log callback passed to run_full_backup().
         File logging is handled separately by each core module.
+
+        The message is queued; _drain_ui() writes every line queued since its
+        last run in one insert, so a burst of messages costs one insert
+        instead of one Tk callback per line.
+        tag selects the line colour: "info", "ok", "warn" or "err".
         """
-        def _write():
-            self._log_box.configure(state="normal")
-            self._log_box.insert("end", msg + "\n")
-            self._log_box.see("end")
-            self._log_box.configure(state="disabled")
-        self.after(0, _write)
+        self._ui_q.put(("log", (msg,), tag))
+
+    def _append_log_block(self, lines: list[str] | tuple[str, ...], tag: str = "info"):
+        """
+        Append several lines to the UI log textbox at once (thread-safe).
+        Queues the whole block as one message, instead of one per line
+        as repeated _append_log() calls would.
+        """
+        self._ui_q.put(("log", lines, tag))
+
+    def _write_log(self, runs: list[tuple[list[str], str]]):
+        """
+        Write log lines to the log textbox (main thread).
+        runs holds (lines, tag) pairs of consecutive lines sharing a colour tag;
+        each run is written in one insert.
+        """
+        if not runs:
+            return
+
+        # Follow new output only while the view is at the bottom — a user who
+        # scrolled up to read earlier lines keeps their place
+        at_bottom = self._log_box.yview()[1] >= 0.999
+
+        for lines, tag in runs:
+            self._log_box.insert("end", "\n".join(lines) + "\n", tag)
+
+        # Trim the oldest lines in place — never clear and re-insert the buffer.
+        # "end-1c" sits on the empty line after the trailing newline, so the
+        # text holds one line fewer than its line number.
+        line_count = int(self._log_box.index("end-1c").split(".")[0]) - 1
+        if line_count > MAX_LOG_LINES + LOG_TRIM_SLACK:
+            self._log_box.delete("1.0", f"{line_count - MAX_LOG_LINES + 1}.0")
+
+        # yview_moveto(1.0) pins the view to the bottom without the bbox
+        # lookup see("end") does first
+        if at_bottom:
+            self._log_box.yview_moveto(1.0)
 
     def _clear_log(self):
         """Clear the UI log textbox."""
-        self._log_box.configure(state="normal")
         self._log_box.delete("1.0", "end")
-        self._log_box.configure(state="disabled")
+
+    def _block_log_edit(self, event) -> str | None:
+        """
+        Key handler that keeps the log box read-only for the user.
+        Lets navigation and copy / select-all shortcuts through; every other
+        key is swallowed before the Text class binding can insert or delete.
+        """
+        if event.keysym in _LOG_NAV_KEYS:
+            return None
+        if event.state & self._copy_modifiers and event.keysym.lower() in ("c", "a"):
+            return None
+        return "break"
 
     # ------------------------------------------------------------------
     # Progress callback (called from worker thread)
     # ------------------------------------------------------------------
 
     def _on_progress(self, current: int, total: int):
-        """Update progress bar from worker thread via after()."""
-        def _update():
-            value = current / total if total > 0 else 0
-            self._progress.set(value)
-        self.after(0, _update)
+        """
+        Queue progress from the worker thread for the next _drain_ui().
+        Steps smaller than PROGRESS_MIN_STEP are dropped (except the final one),
+        and _drain_ui() draws only the latest value it finds, so the progress
+        bar is redrawn at most once per UI_DRAIN_MS.
+        An empty pass (total == 0) has nothing to show and queues nothing.
+        """
+        if total <= 0:
+            return
+
+        value = current / total
+        if current != total and abs(value - self._last_progress_value) < PROGRESS_MIN_STEP:
+            return
+
+        self._last_progress_value = value
+        self._ui_q.put(("progress", value))
+
+    # ------------------------------------------------------------------
+    # UI message queue — drained on the main thread
+    # ------------------------------------------------------------------
+
+    def _drain_ui(self):
+        """
+        Handle the messages queued since the last run (at most
+        UI_DRAIN_MAX_ITEMS of them), then reschedule itself.
+        Log lines are gathered into one insert per run of same-coloured lines,
+        and only the newest progress value is drawn. Before any other message
+        is handled, what was gathered so far is written, so e.g. the run
+        summary always follows the run's log.
+        """
+        try:
+            runs: list[tuple[list[str], str]] = []
+            progress = None
+            for _ in range(UI_DRAIN_MAX_ITEMS):
+                try:
+                    item = self._ui_q.get_nowait()
+                except queue.Empty:
+                    break
+                kind = item[0]
+                if kind == "log":
+                    _, lines, tag = item
+                    if runs and runs[-1][1] == tag:
+                        runs[-1][0].extend(lines)
+                    else:
+                        runs.append((list(lines), tag))
+                    continue
+                if kind == "progress":
+                    progress = item[1]
+                    continue
+
+                self._show_drained(runs, progress)
+                runs = []
+                progress = None
+
+                try:
+                    if kind == "header":
+                        self._apply_header_info(item[1])
+                    elif kind == "settled":
+                        self._settle(item[1])
+                except Exception:
+                    self._log_drain_error(f"'{kind}' message")
+                    if kind == "settled":
+                        # The run is over either way — don't leave Start stuck
+                        # in "執行中..." because its end-of-run handler failed
+                        try:
+                            self._on_aborted()
+                        except Exception:
+                            self._log_drain_error("start button reset")
+
+            self._show_drained(runs, progress)
+        finally:
+            # Always reschedule: one failed message must not stop the UI updates
+            self.after(UI_DRAIN_MS, self._drain_ui)
+
+    def _show_drained(self, runs: list[tuple[list[str], str]], progress):
+        """
+        Write the log runs and newest progress value gathered by _drain_ui().
+        Each is tried on its own, so a failed log write still lets the
+        progress bar move (and the other way round).
+        """
+        try:
+            self._write_log(runs)
+        except Exception:
+            self._log_drain_error("log write")
+        if progress is not None:
+            try:
+                self._progress.set(progress)
+            except Exception:
+                self._log_drain_error("progress update")
+
+    def _log_drain_error(self, what: str):
+        """Log the traceback of a UI update that failed inside _drain_ui()."""
+        tb_text = traceback.format_exc()
+        self._logger.critical(f"UI update failed ({what}):\n{tb_text}")
 
     # ------------------------------------------------------------------
     # Backup execution
     # ------------------------------------------------------------------
 
     def _start(self):
-        """Validate inputs, reset UI, then launch backup in background thread."""
+        """
+        Reset UI, then launch backup in background thread.
+        Input folders are checked by the worker thread, so a slow or
+        network-mounted backup folder never blocks the UI when Start is clicked.
+        """
         data_dir = self._data_row.path
-        plurks_dir = data_dir / "data" / "plurks"
-        responses_dir = data_dir / "data" / "responses"
+        data_sub_dir = data_dir / DATA_SUB
+        plurks_dir = data_sub_dir / "plurks"
+        responses_dir = data_sub_dir / "responses"
         output_root = data_dir / "plurk_images_by_date"
         do_exif = self._exif_var.get()
 
         # Reset UI
         self._clear_log()
         self._progress.set(0)
-        self._card_dl.set(0)
-        self._card_skip.set(0)
-        self._card_exif.set(0)
-        self._card_fail.set(0)
+        self._last_progress_value = 0.0
+        self._ensure_stats_row()
+        self._stats[:] = (0, 0, 0, 0)
+        self._publish_stats()
         self._set_header_info("")
 
         self._logger.info("--- Backup run started ---")
@@ -632,41 +922,44 @@ class App(ctk.CTk):
         self._logger.info(f"Output : {output_root}")
         self._logger.info(f"EXIF   : {do_exif}")
 
-        plurks_ok = plurks_dir.exists()
-        responses_ok = responses_dir.exists()
-
-        self._logger.info(f"plurks/    exists: {plurks_ok}")
-        self._logger.info(f"responses/ exists: {responses_ok}")
-
-        self._append_log(t("log_checking_folders"))
-        self._append_log(f"   {'[OK]' if plurks_ok else '[NG]'} {plurks_dir}")
-        self._append_log(f"   {'[OK]' if responses_ok else '[NG]'} {responses_dir}")
-        self._append_log("")
-
-        if not plurks_ok and not responses_ok:
-            self._append_log(t("log_warn_no_folders"))
-            self._logger.error("Abort: neither plurks/ nor responses/ found")
-            return
-
-        if not plurks_ok:
-            self._append_log(t("log_warn_no_plurks"))
-            self._logger.warning("plurks/ not found — processing responses/ only")
-        if not responses_ok:
-            self._append_log(t("log_warn_no_responses"))
-            self._logger.warning("responses/ not found — processing plurks/ only")
-        self._append_log("")
-
         self._start_btn.configure(state="disabled", text=t("btn_running"))
-
-        self._append_log(t("log_start_backup"))
-        self._append_log(t("log_input_folder",  path=data_dir))
-        self._append_log(t("log_output_folder", path=output_root))
-        self._append_log(t("log_exif_label",    value=t("log_exif_enabled") if do_exif else t("log_exif_disabled")))
-        self._append_log("")
-
         self._running = True
 
-        def worker():
+        def worker() -> ProcessStats | None:
+            # Step 0: check the input folders
+            plurks_ok = plurks_dir.exists()
+            responses_ok = responses_dir.exists()
+
+            self._logger.info(f"plurks/    exists: {plurks_ok}")
+            self._logger.info(f"responses/ exists: {responses_ok}")
+
+            self._append_log(t("log_checking_folders"))
+            self._append_log(f"   {'[OK]' if plurks_ok else '[NG]'} {plurks_dir}", "ok" if plurks_ok else "warn")
+            self._append_log(f"   {'[OK]' if responses_ok else '[NG]'} {responses_dir}",
+                             "ok" if responses_ok else "warn")
+            self._append_log("")
+
+            if not plurks_ok and not responses_ok:
+                self._append_log(t("log_warn_no_folders"), "err")
+                self._logger.error("Abort: neither plurks/ nor responses/ found")
+                return None
+
+            if not plurks_ok:
+                self._append_log(t("log_warn_no_plurks"), "warn")
+                self._logger.warning("plurks/ not found — processing responses/ only")
+            if not responses_ok:
+                self._append_log(t("log_warn_no_responses"), "warn")
+                self._logger.warning("responses/ not found — processing plurks/ only")
+
+            self._append_log_block([
+                "",
+                t("log_start_backup"),
+                t("log_input_folder",  path=data_dir),
+                t("log_output_folder", path=output_root),
+                t("log_exif_label",    value=t("log_exif_enabled") if do_exif else t("log_exif_disabled")),
+                "",
+            ])
+
             # Step 1: prescan to count files that need downloading
             try:
                 self._append_log(t("log_scanning"))
@@ -685,16 +978,15 @@ class App(ctk.CTk):
 
                 files_text = t("log_scan_summary", new=total_new, existing=total_existing)
                 self._set_header_info(files_text)
-                self._append_log(files_text)
-                self._append_log("")
+                self._append_log_block((files_text, ""))
 
             except Exception as e:
                 self._logger.warning(f"Prescan failed: {type(e).__name__}: {e}")
-                self._append_log(t("log_scan_error"))
+                self._append_log(t("log_scan_error"), "warn")
                 self._append_log("")
 
             # Step 2: full backup
-            stats: ProcessStats = run_full_backup(
+            return run_full_backup(
                 plurks_dir=plurks_dir,
                 responses_dir=responses_dir,
                 output_root=output_root,
@@ -702,19 +994,62 @@ class App(ctk.CTk):
                 on_log=self._append_log,
                 on_progress=self._on_progress,
             )
-            self.after(0, lambda: self._on_done(stats))
 
-        threading.Thread(target=worker, daemon=True, name="backup-worker").start()
+        # The run's outcome — stats, None when aborted, or the exception it
+        # raised — lands in one Future, settled on the main thread by _settle().
+        # A daemon thread rather than a ThreadPoolExecutor: executor threads
+        # are joined at interpreter exit, so closing the window mid-run would
+        # wait for the whole backup instead of exiting.
+        future: Future = Future()
+        future.add_done_callback(lambda f: self._ui_q.put(("settled", f)))
+
+        def run():
+            try:
+                future.set_result(worker())
+            except BaseException as exc:
+                future.set_exception(exc)
+
+        threading.Thread(target=run, daemon=True, name="backup-worker").start()
+
+    def _settle(self, future: Future):
+        """
+        Called on main thread when a backup run has ended, however it ended:
+        completed, aborted before starting, or crashed.
+        """
+        exc = future.exception()
+        if exc is not None:
+            tb_text = "".join(traceback.format_exception(type(exc), exc, exc.__traceback__))
+            self._logger.critical(f"Unhandled exception in thread 'backup-worker':\n{tb_text}")
+            self._on_worker_crash()
+            return
+
+        stats = future.result()
+        if stats is None:
+            self._on_aborted()
+        else:
+            self._on_done(stats)
+
+    def _publish_stats(self):
+        """
+        Copy the run counts in self._stats to the stat row (main thread).
+        The number labels are configured directly — no Tk variable trace in
+        between — and Tk redraws them together on its next idle pass.
+        """
+        for value_label, value in zip(self._stat_labels, self._stats):
+            value_label.configure(text=str(value))
+
+    def _on_aborted(self):
+        """Called on main thread when the worker found no input folder to process."""
+        self._running = False
+        self._start_btn.configure(state="normal", text=t("btn_start_backup"))
 
     def _on_done(self, stats: ProcessStats):
         """Called on main thread when backup completes normally."""
         self._running = False
 
         self._progress.set(1)
-        self._card_dl.set(stats.downloaded)
-        self._card_skip.set(stats.skipped)
-        self._card_exif.set(stats.exif_updated)
-        self._card_fail.set(stats.failed)
+        self._stats[:] = (stats.downloaded, stats.skipped, stats.exif_updated, stats.failed)
+        self._publish_stats()
 
         self._logger.info("--- Backup run completed ---")
         self._logger.info(f"Downloaded : {stats.downloaded}")
@@ -722,15 +1057,16 @@ class App(ctk.CTk):
         self._logger.info(f"Failed     : {stats.failed}")
         self._logger.info(f"EXIF       : {stats.exif_updated}")
 
-        self._append_log("")
-        self._append_log("=" * 36)
-        self._append_log(t("log_done_title"))
-        self._append_log(t("log_done_downloaded", count=stats.downloaded))
-        self._append_log(t("log_done_skipped",    count=stats.skipped))
-        self._append_log(t("log_done_failed",      count=stats.failed))
-        if stats.exif_updated:
-            self._append_log(t("log_done_exif",   count=stats.exif_updated))
-        self._append_log("=" * 36)
+        self._append_log_block(["", "=" * 36])
+        self._append_log(t("log_done_title"), "ok")
+        self._append_log_block([
+            t("log_done_downloaded", count=stats.downloaded),
+            t("log_done_skipped",    count=stats.skipped),
+        ])
+        self._append_log(t("log_done_failed", count=stats.failed), "err" if stats.failed else "info")
+        lines = [t("log_done_exif", count=stats.exif_updated)] if stats.exif_updated else []
+        lines.append("=" * 36)
+        self._append_log_block(lines)
 
         self._start_btn.configure(state="normal", text=t("btn_start_backup"))
 
@@ -757,4 +1093,7 @@ def main():
 
 
 if __name__ == "__main__":
+    # Required for the JS parsing worker processes in a PyInstaller build —
+    # a no-op when running from source
+    multiprocessing.freeze_support()
     main()